@@ -0,0 +1,180 @@
+import os
+import json
+import tempfile
+
+# Persistent name -> package path index for an exported Content folder.
+# Built with one directory scan, saved beside the Content folder (not inside it,
+# so saving never touches a scanned mtime) and refreshed per directory by mtime
+# so later runs only re-list folders that changed.
+
+INDEX_VERSION = 1
+INDEX_FILE_SUFFIX = ".asset_index.json"
+
+
+class AssetIndex:
+    def __init__(self, content_dir, content_root="/Game/", cache_path=None, extension=".uasset"):
+        self.content_dir = os.path.abspath(content_dir)
+        self.content_root = "/" + content_root.strip("/")
+        self.cache_path = cache_path or self.content_dir + INDEX_FILE_SUFFIX
+        self.extension = extension.lower()
+        self.dirs = {}
+        self.names = {}
+        self.missing = set()
+        self.duplicates = {}
+        self.changed_dirs = 0
+        self._warned = set()
+
+    # === BUILD / REFRESH ===
+    def load(self):
+        """Load the saved index, re-list changed folders and save it back."""
+        cached = self._read_cache()
+        self.dirs = {}
+        self.changed_dirs = 0
+        self._scan_dir("", cached.get("dirs", {}))
+        self.missing = set() if self.changed_dirs else set(cached.get("missing", []))
+        self._build_name_map()
+        self.save()
+        return self
+
+    def _read_cache(self):
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable asset index {self.cache_path}: {e}")
+            return {}
+        if cached.get("version") != INDEX_VERSION or cached.get("content_dir") != self.content_dir:
+            return {}
+        return cached
+
+    def _scan_dir(self, rel_dir, cached_dirs):
+        stack = [rel_dir]
+        while stack:
+            rel = stack.pop()
+            full = os.path.join(self.content_dir, rel) if rel else self.content_dir
+            try:
+                mtime = os.stat(full).st_mtime
+            except OSError:
+                continue
+
+            entry = cached_dirs.get(rel)
+            if entry is None or entry.get("mtime") != mtime:
+                entry = self._list_dir(full, mtime)
+                self.changed_dirs += 1
+
+            self.dirs[rel] = entry
+            for sub in entry["subdirs"]:
+                stack.append(rel + "/" + sub if rel else sub)
+
+    def _list_dir(self, full, mtime):
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(full) as it:
+                for item in it:
+                    if item.is_dir(follow_symlinks=False):
+                        subdirs.append(item.name)
+                    elif item.name.lower().endswith(self.extension):
+                        files.append(item.name[:-len(self.extension)])
+        except OSError as e:
+            print(f"⚠️ Could not list {full}: {e}")
+        return {"mtime": mtime, "files": sorted(files), "subdirs": sorted(subdirs)}
+
+    def _build_name_map(self):
+        self.names = {}
+        for rel in sorted(self.dirs):
+            prefix = self.content_root + "/" + rel if rel else self.content_root
+            for base in self.dirs[rel]["files"]:
+                self.names.setdefault(base.lower(), []).append(prefix + "/" + base)
+        self.duplicates = {name: paths for name, paths in self.names.items() if len(paths) > 1}
+
+    def save(self):
+        data = {
+            "version": INDEX_VERSION,
+            "content_dir": self.content_dir,
+            "dirs": self.dirs,
+            "missing": sorted(self.missing),
+        }
+        # a tmp file per process: several editors (reconstruct_sharded.py) may save at once
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=os.path.basename(self.cache_path) + ".", suffix=".tmp", dir=os.path.dirname(self.cache_path))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not save asset index {self.cache_path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # === LOOKUPS ===
+    def candidates(self, name):
+        return self.names.get(name.lower(), [])
+
+    def find(self, name, hint_path=""):
+        """Return the package path for ``name`` or None.
+
+        ``hint_path`` is the original FModel ObjectPath; it is used to pick
+        between assets that share a basename in different folders.
+        """
+        key = name.lower()
+        if key in self.missing:
+            return None
+
+        paths = self.names.get(key)
+        if not paths:
+            self.missing.add(key)
+            return None
+        if len(paths) == 1:
+            return paths[0]
+
+        hinted = self._match_hint(paths, hint_path)
+        if hinted:
+            return hinted
+
+        if key not in self._warned:
+            self._warned.add(key)
+            print(f"⚠️ Ambiguous asset name '{name}' ({len(paths)} matches), using {paths[0]}:")
+            for path in paths:
+                print(f"     {path}")
+        return paths[0]
+
+    def _match_hint(self, paths, hint_path):
+        if not hint_path:
+            return None
+        hint = hint_path.replace("\\", "/").split(".")[0].lower()
+        # FModel paths look like "fnaf9/Content/Foo/Bar" or "/Game/Foo/Bar"
+        for marker in ("/content/", "/game/"):
+            if marker in "/" + hint:
+                hint = ("/" + hint).split(marker, 1)[1]
+                break
+        hint = hint.strip("/")
+        matches = [p for p in paths if p.lower().endswith("/" + hint)]
+        return matches[0] if len(matches) == 1 else None
+
+    def report_duplicates(self):
+        if not self.duplicates:
+            return
+        print(f"⚠️ {len(self.duplicates)} asset names exist in more than one folder:")
+        for name in sorted(self.duplicates):
+            print(f"  {name}:")
+            for path in self.duplicates[name]:
+                print(f"     {path}")
+
+
+def load_asset_index(content_dir, content_root="/Game/", cache_path=None):
+    return AssetIndex(content_dir, content_root, cache_path).load()
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python asset_index.py <Content folder>")
+        raise SystemExit(1)
+    index = load_asset_index(sys.argv[1])
+    print(f"✅ Indexed {len(index.names)} asset names in {len(index.dirs)} folders "
+          f"({index.changed_dirs} re-listed)")
+    index.report_duplicates()
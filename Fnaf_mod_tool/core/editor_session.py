@@ -0,0 +1,81 @@
+import os
+import json
+import tempfile
+
+# Runs several editor scripts in one UE4Editor-Cmd process.
+# write_bootstrap() generates a small Python file that the editor executes via
+# -ExecutePythonScript; it runs each selected script in order with runpy (so
+# __file__ and __name__ == "__main__" behave as in a standalone run), keeps
+# going after a failure and prints one result line per script. The launcher
+# picks those lines out of the editor log with parse_result().
+
+RESULT_PREFIX = "@@SCRIPT_RESULT "
+BOOTSTRAP_NAME = "ue4_session_bootstrap.py"
+# Written by gui.py next to it; command line tools reuse the paths picked there
+LAUNCHER_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json")
+
+BOOTSTRAP_TEMPLATE = '''import sys
+import json
+import time
+import runpy
+import traceback
+
+SCRIPTS = {scripts}
+RESULT_PREFIX = {prefix}
+
+for script in SCRIPTS:
+    start = time.time()
+    error = ""
+    print(f"=== Running {{script}} ===", flush=True)
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            error = f"exited with code {{e.code}}"
+    except Exception as e:
+        traceback.print_exc()
+        error = f"{{type(e).__name__}}: {{e}}"
+    print(RESULT_PREFIX + json.dumps({{
+        "script": script,
+        "ok": not error,
+        "error": error,
+        "seconds": round(time.time() - start, 3),
+    }}), flush=True)
+'''
+
+
+def load_editor_paths(config_file=LAUNCHER_CONFIG):
+    """Return (UE4Editor-Cmd path, .uproject path) saved by the launcher, or empty strings."""
+    if os.path.exists(config_file):
+        with open(config_file, "r") as f:
+            data = json.load(f)
+        return data.get("uecmd_path", ""), data.get("project_path", "")
+    return "", ""
+
+
+def write_bootstrap(scripts, path=None):
+    """Write the session bootstrap for ``scripts`` (absolute paths) and return its path."""
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(), BOOTSTRAP_NAME)
+    source = BOOTSTRAP_TEMPLATE.format(
+        scripts=json.dumps([os.path.abspath(s) for s in scripts], indent=4),
+        prefix=json.dumps(RESULT_PREFIX),
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source)
+    return path
+
+
+def parse_result(line):
+    """Return the result dict from an editor log line, or None.
+
+    The editor prefixes Python output (e.g. "LogPython: "), so the marker is
+    searched for anywhere in the line.
+    """
+    index = line.find(RESULT_PREFIX)
+    if index < 0:
+        return None
+    try:
+        return json.loads(line[index + len(RESULT_PREFIX):])
+    except ValueError:
+        return None
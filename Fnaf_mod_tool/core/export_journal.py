@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import sqlite3
+
+# Crash-safe progress journal for the uasset -> FBX exports.
+# Every file's outcome, error text and duration is committed to SQLite the
+# moment it finishes (WAL mode), so a Blender crash loses at most the file it
+# was working on. Lookups go through the primary key; failures can be listed
+# for a targeted retry:
+#   python -m core.export_journal export_journal.db --failures
+#   python bulk_export_pool.py --retry-failed
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exports (
+    file TEXT PRIMARY KEY,
+    ok INTEGER NOT NULL,
+    error TEXT NOT NULL DEFAULT '',
+    seconds REAL NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    updated REAL NOT NULL
+)
+"""
+CRASHED_ERROR = "crashed or was killed before finishing"
+
+
+class ExportJournal:
+    def __init__(self, path, legacy_state=None):
+        """Open (or create) the journal at ``path``.
+
+        ``legacy_state`` is an old batch_state.json; its "processed" and
+        "failed" entries are imported the first time the journal is created.
+        """
+        self.path = path
+        is_new = not os.path.exists(path)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(SCHEMA)
+        self.db.commit()
+        if is_new and legacy_state and os.path.exists(legacy_state):
+            self.import_state(legacy_state)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # === WRITING ===
+    def record(self, path, ok, error="", seconds=0.0, new_attempt=True):
+        """Store one file's outcome and commit right away."""
+        self.db.execute(
+            "INSERT OR REPLACE INTO exports (file, ok, error, seconds, attempts, updated) VALUES "
+            "(?, ?, ?, ?, COALESCE((SELECT attempts FROM exports WHERE file = ?), 0) + ?, ?)",
+            (path, 1 if ok else 0, error or "", float(seconds or 0.0), path, 1 if new_attempt else 0, time.time()))
+        self.db.commit()
+
+    def start(self, path):
+        """Mark ``path`` as failed until record(..., new_attempt=False) says otherwise.
+
+        If the process dies on this file, the next run skips it instead of
+        crashing on it again.
+        """
+        self.record(path, False, CRASHED_ERROR)
+
+    def import_state(self, state_file):
+        with open(state_file, "r") as f:
+            state = json.load(f)
+        now = time.time()
+        rows = [(path, 1, "", now) for path in state.get("processed", [])]
+        rows += [(entry["file"], 0, entry.get("error", ""), now) for entry in state.get("failed", [])]
+        self.db.executemany(
+            "INSERT OR IGNORE INTO exports (file, ok, error, updated) VALUES (?, ?, ?, ?)", rows)
+        self.db.commit()
+        print(f"📥 Imported {len(rows)} entries from {state_file}")
+
+    # === READING ===
+    def is_done(self, path):
+        return self.db.execute("SELECT 1 FROM exports WHERE file = ? AND ok = 1", (path,)).fetchone() is not None
+
+    def done_files(self):
+        """Set of successfully exported paths, for filtering long file lists."""
+        return {row[0] for row in self.db.execute("SELECT file FROM exports WHERE ok = 1")}
+
+    def recorded_files(self):
+        return {row[0] for row in self.db.execute("SELECT file FROM exports")}
+
+    def pending(self, files, retry_failed=False):
+        """``files`` without the ones already attempted, order kept.
+
+        Failed files are left out too (so a batch can't loop on them) unless
+        ``retry_failed`` is set.
+        """
+        skip = self.done_files() if retry_failed else self.recorded_files()
+        return [path for path in files if path not in skip]
+
+    def failures(self):
+        """[(file, error, seconds, attempts)] of files whose last attempt failed."""
+        return self.db.execute(
+            "SELECT file, error, seconds, attempts FROM exports WHERE ok = 0 ORDER BY file").fetchall()
+
+    def failed_files(self):
+        return [row[0] for row in self.failures()]
+
+    def summary(self):
+        ok, failed = self.db.execute(
+            "SELECT COALESCE(SUM(ok = 1), 0), COALESCE(SUM(ok = 0), 0) FROM exports").fetchone()
+        return {"exported": ok, "failed": failed}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the bulk export journal")
+    parser.add_argument("journal")
+    parser.add_argument("--failures", action="store_true", help="list files whose last attempt failed")
+    args = parser.parse_args()
+
+    with ExportJournal(args.journal) as journal:
+        counts = journal.summary()
+        print(f"✅ {counts['exported']} exported, ❌ {counts['failed']} failed")
+        if args.failures:
+            for path, error, seconds, attempts in journal.failures():
+                print(f"   {path}  ({attempts} attempts, {seconds:.1f}s): {error}")
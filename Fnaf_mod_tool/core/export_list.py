@@ -0,0 +1,73 @@
+import os
+from collections import Counter
+
+from core.uasset_reader import read_asset_class
+
+# Builds the list of .uasset files a bulk export run should handle.
+# Shared by the Blender export scripts and the bpy-free worker pool.
+# Files are routed by the main export's class from the package header, so
+# textures, materials, blueprints and data assets never reach Blender.
+
+ROUTE_STATIC_MESH = "static_mesh"
+ROUTE_SKELETAL_MESH = "skeletal_mesh"
+ROUTE_SKIP = "skip"
+CLASS_ROUTES = {
+    "StaticMesh": ROUTE_STATIC_MESH,
+    "SkeletalMesh": ROUTE_SKELETAL_MESH,
+}
+
+
+def route_for_class(asset_class):
+    return CLASS_ROUTES.get(asset_class, ROUTE_SKIP)
+
+
+def route_uassets(paths):
+    """Split ``paths`` by header class into {route: [path, ...]}; unreadable headers are skipped."""
+    routes = {ROUTE_STATIC_MESH: [], ROUTE_SKELETAL_MESH: [], ROUTE_SKIP: []}
+    skipped = Counter()
+    for path in paths:
+        asset_class = read_asset_class(path)
+        route = route_for_class(asset_class)
+        routes[route].append(path)
+        if route == ROUTE_SKIP:
+            skipped[asset_class or "<unreadable header>"] += 1
+    print(f"🧭 {len(routes[ROUTE_STATIC_MESH])} static meshes, {len(routes[ROUTE_SKELETAL_MESH])} skeletal meshes, "
+          f"{len(routes[ROUTE_SKIP])} skipped")
+    for asset_class, count in skipped.most_common():
+        print(f"  ⏭️ {count:6d}  {asset_class}")
+    return routes
+
+
+def mesh_uassets(paths):
+    """Only the static and skeletal meshes among ``paths``, order kept."""
+    routes = route_uassets(paths)
+    keep = set(routes[ROUTE_STATIC_MESH]) | set(routes[ROUTE_SKELETAL_MESH])
+    return [path for path in paths if path in keep]
+
+
+def read_listed_names(list_file):
+    with open(list_file, 'r') as f:
+        return {(name.strip().lower() + ".uasset") for name in f if name.strip()}
+
+
+def find_listed_uassets(uasset_dir, list_file):
+    """Return not-yet-exported mesh .uasset paths whose names are in ``list_file``."""
+    if not os.path.exists(list_file):
+        print(f"❌ List file not found: {list_file}")
+        return []
+
+    listed_names = read_listed_names(list_file)
+
+    print(f"🔍 Scanning {uasset_dir} for listed assets...")
+    matched_files = []
+    for root, _, files in os.walk(uasset_dir):
+        for file in files:
+            file_lc = file.lower()
+            if file_lc in listed_names:
+                full_path = os.path.join(root, file)
+                fbx_path = full_path[:-6] + ".fbx"
+                if not os.path.exists(fbx_path):
+                    matched_files.append(full_path)
+                    print(f"  ✅ Found match: {file}")
+    print(f"✅ Total matched files: {len(matched_files)}")
+    return mesh_uassets(matched_files)
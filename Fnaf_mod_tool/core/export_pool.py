@@ -0,0 +1,280 @@
+import os
+import sys
+import json
+import time
+import queue
+import threading
+import subprocess
+from collections import deque
+
+# Coordinator for N background worker processes (normally Blender running
+# bulk_export_new.py in --worker mode). Workers pull one path at a time from a
+# shared queue over stdin and answer with a single result line on stdout, so
+# a fast worker simply takes more files than a slow one. Each result is written
+# to the ExportJournal (core/export_journal.py) as soon as it arrives.
+# Every file gets a wall-clock timeout. A worker that hangs or crashes on a
+# file is killed and restarted; the file is quarantined (recorded as failed
+# and added to the quarantine report) and the batch carries on.
+# Check the ok/fail/hang/crash paths with fake workers (no Blender needed):
+#   python -m core.export_pool --self-test
+
+RESULT_PREFIX = "@@EXPORT_RESULT "
+QUARANTINE_PREFIX = "quarantined: "  # start of the journal error for a file that hung or crashed its worker
+ASSET_TIMEOUT = 300.0  # seconds per file, including Blender start-up for a worker's first file
+MAX_CRASHES_IN_A_ROW = 3  # a worker that crashes this often without a result is not restarted again
+TAIL_LINES = 20  # worker output kept for the quarantine report
+
+
+# === WORKER SIDE ===
+def serve(process_file):
+    """Run inside a worker: export each path read from stdin, report on stdout.
+
+    ``process_file(path)`` returns True/False or (ok, error_text).
+    """
+    for line in sys.stdin:
+        path = line.strip()
+        if not path:
+            continue
+        start = time.time()
+        error = ""
+        try:
+            result = process_file(path)
+        except Exception as e:
+            result = False
+            error = str(e)
+        if isinstance(result, tuple):
+            ok, error = result
+        else:
+            ok = bool(result)
+        if not ok and not error:
+            error = "export failed"
+        print(RESULT_PREFIX + json.dumps({
+            "file": path,
+            "ok": ok,
+            "error": error,
+            "seconds": round(time.time() - start, 3),
+        }), flush=True)
+
+
+def parse_result(line):
+    if not line.startswith(RESULT_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(RESULT_PREFIX):])
+    except ValueError:
+        return None
+
+
+# === COORDINATOR SIDE ===
+class ExportPool:
+    def __init__(self, worker_cmd, workers=None, journal=None, verbose=True,
+                 timeout=ASSET_TIMEOUT, quarantine_file=None):
+        self.worker_cmd = list(worker_cmd)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.journal = journal
+        self.verbose = verbose
+        self.timeout = timeout
+        self.quarantine_file = quarantine_file
+        self.quarantine_lock = threading.Lock()
+        self.work = queue.Queue()
+        self.results = queue.Queue()
+
+    def _start_worker(self):
+        env = dict(os.environ)
+        # worker output is a pipe; keep emoji logging from crashing on Windows
+        env["PYTHONIOENCODING"] = "utf-8"
+        env["PYTHONUNBUFFERED"] = "1"
+        proc = subprocess.Popen(
+            self.worker_cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+
+        # stdout is drained by a thread so waiting for a result can time out
+        lines = queue.Queue()
+
+        def pump():
+            for line in proc.stdout:
+                lines.put(line)
+            lines.put(None)
+
+        threading.Thread(target=pump, daemon=True).start()
+        return proc, lines
+
+    def _wait_result(self, worker_id, proc, lines, tail):
+        """The worker's result line, or (None, reason) if it hangs or dies first."""
+        deadline = time.time() + self.timeout if self.timeout else None
+        while True:
+            try:
+                line = lines.get(timeout=max(0.0, deadline - time.time()) if deadline else None)
+            except queue.Empty:
+                return None, f"timed out after {self.timeout:g}s"
+            if line is None:
+                return None, f"worker crashed (exit code {proc.wait()})"
+            result = parse_result(line)
+            if result is not None:
+                return result, ""
+            tail.append(line.rstrip())
+            if self.verbose:
+                print(f"[w{worker_id}] {line.rstrip()}")
+
+    def _stop_worker(self, proc):
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        if proc.poll() is None:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    def _quarantine(self, path, reason, tail):
+        if not self.quarantine_file:
+            return
+        with self.quarantine_lock, open(self.quarantine_file, "a", encoding="utf-8") as f:
+            f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}  {path}\n")
+            f.write(f"    reason: {reason}\n")
+            if tail:
+                f.write("    last output:\n")
+                f.writelines(f"        {line}\n" for line in tail)
+            f.write("\n")
+
+    def _run_worker(self, worker_id):
+        proc = lines = None
+        crashes = 0
+        try:
+            while True:
+                try:
+                    path = self.work.get_nowait()
+                except queue.Empty:
+                    break
+
+                if proc is None:
+                    proc, lines = self._start_worker()
+                start = time.time()
+                tail = deque(maxlen=TAIL_LINES)
+                try:
+                    proc.stdin.write(path + "\n")
+                    proc.stdin.flush()
+                    result, reason = self._wait_result(worker_id, proc, lines, tail)
+                except OSError as e:
+                    result, reason = None, f"lost worker process: {e}"
+
+                if result is not None:
+                    crashes = 0
+                    self.results.put(result)
+                    continue
+
+                # kill the stuck or dead worker, quarantine the file, start a fresh worker
+                if proc.poll() is None:
+                    proc.kill()
+                proc.wait()
+                print(f"☣️ [w{worker_id}] quarantined {path}: {reason}")
+                self._quarantine(path, reason, tail)
+                self.results.put({"file": path, "ok": False, "seconds": round(time.time() - start, 3),
+                                  "error": QUARANTINE_PREFIX + reason})
+                crashes += 1
+                proc = None
+                if crashes >= MAX_CRASHES_IN_A_ROW:
+                    print(f"❌ [w{worker_id}] {crashes} crashes in a row, not restarting this worker")
+                    return
+                print(f"🔁 [w{worker_id}] restarting worker")
+        finally:
+            if proc is not None:
+                self._stop_worker(proc)
+
+    def run(self, files):
+        """Export ``files`` across the workers; returns {"exported", "failed", "not_attempted"}."""
+        exported = failed = 0
+        for path in files:
+            self.work.put(path)
+
+        total = len(files)
+        threads = [threading.Thread(target=self._run_worker, args=(i,), daemon=True)
+                   for i in range(min(self.workers, total))]
+        for t in threads:
+            t.start()
+
+        done = 0
+        start = time.time()
+        while done < total:
+            try:
+                result = self.results.get(timeout=1.0)
+            except queue.Empty:
+                if not any(t.is_alive() for t in threads) and self.results.empty():
+                    break
+                continue
+            done += 1
+            path = result["file"]
+            if result.get("ok"):
+                exported += 1
+            else:
+                failed += 1
+            if self.journal:
+                self.journal.record(path, result.get("ok"), result.get("error", ""), result.get("seconds", 0.0))
+            rate = done / max(time.time() - start, 1e-6)
+            print(f"{'✅' if result.get('ok') else '⏭️'} [{done}/{total}, {rate:.2f} files/s] {path}")
+
+        for t in threads:
+            t.join()
+        print(f"🏁 {exported} exported, {failed} failed, "
+              f"{total - done} not attempted in {time.time() - start:.1f}s")
+        if self.quarantine_file and os.path.exists(self.quarantine_file):
+            print(f"☣️ Quarantined files are listed in {self.quarantine_file}")
+        return {"exported": exported, "failed": failed, "not_attempted": total - done}
+
+
+# === FAKE WORKER (scheduling tests without Blender) ===
+def fake_process(path):
+    name = os.path.basename(path).upper()
+    if "HANG" in name:
+        time.sleep(3600)
+    if "CRASH" in name:
+        os._exit(3)
+    time.sleep(float(os.environ.get("FAKE_EXPORT_SECONDS", "0.05")))
+    if "FAIL" in os.path.basename(path).upper():
+        return False, "fake failure"
+    return True
+
+
+def fake_worker_cmd():
+    return [sys.executable, os.path.abspath(__file__), "--fake-worker"]
+
+
+def self_test(workers=2, timeout=3.0):
+    """Run fake workers over ok/FAIL/HANG/CRASH files; raises AssertionError on a wrong outcome."""
+    import tempfile
+    from core.export_journal import ExportJournal
+
+    files = [f"/fake/ok_{i}.uasset" for i in range(6)]
+    files += ["/fake/FAIL_me.uasset", "/fake/HANG_me.uasset", "/fake/CRASH_me.uasset", "/fake/ok_after.uasset"]
+    with tempfile.TemporaryDirectory() as tmp:
+        quarantine_file = os.path.join(tmp, "quarantine_report.txt")
+        with ExportJournal(os.path.join(tmp, "journal.db")) as journal:
+            pool = ExportPool(fake_worker_cmd(), workers=workers, journal=journal, verbose=False,
+                              timeout=timeout, quarantine_file=quarantine_file)
+            counts = pool.run(files)
+            assert counts == {"exported": 7, "failed": 3, "not_attempted": 0}, counts
+            errors = {path: error for path, error, _, _ in journal.failures()}
+            assert errors["/fake/FAIL_me.uasset"] == "fake failure", errors
+            assert errors["/fake/HANG_me.uasset"].startswith(QUARANTINE_PREFIX + "timed out"), errors
+            assert errors["/fake/CRASH_me.uasset"].startswith(QUARANTINE_PREFIX + "worker crashed"), errors
+            assert len(journal.done_files()) == 7
+        with open(quarantine_file, encoding="utf-8") as f:
+            report = f.read()
+        assert "HANG_me" in report and "CRASH_me" in report and "FAIL_me" not in report, report
+    print("✅ export pool self-test passed (ok, fail, hang and crash handled)")
+
+
+if __name__ == "__main__":
+    if "--fake-worker" in sys.argv:
+        serve(fake_process)
+    elif "--self-test" in sys.argv:
+        self_test()
@@ -0,0 +1,174 @@
+import os
+import errno
+import shutil
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Staging engine for FilesToProject.py / AutoFilesToProject.py.
+# The destination layout (including the list's common path) is worked out
+# once, destination folders are created up front, then files are placed by a
+# thread pool. Each file is placed the cheapest way the filesystem allows:
+# reflink (copy-on-write clone), hardlink (only when asked for, since the
+# staged file is then the source file), copy_file_range, sendfile, and
+# finally shutil.copy2.
+
+DEFAULT_WORKERS = 8
+FICLONE = 0x40049409  # Linux ioctl: share the source's blocks copy-on-write (btrfs, XFS)
+COPY_CHUNK = 64 * 1024 * 1024
+# errors meaning "this filesystem can't do that", as opposed to a problem with one file
+UNSUPPORTED_ERRNOS = {None, errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOSYS, errno.EINVAL,
+                      errno.EPERM, errno.ENOTTY, errno.EMLINK}
+
+# (source device, destination device) -> methods that already failed there
+_failed_methods = {}
+_failed_lock = threading.Lock()
+
+
+def read_path_list(txt_file):
+    with open(txt_file, 'r') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def plan_staging(lines, source_folder, destination_root):
+    """Return ([(source file, destination file)], [base names with no source file]).
+
+    Every source file whose base name appears in ``lines`` goes to the folder
+    of the first listed path with that base name, relative to the list's
+    common path.
+    """
+    if not lines:
+        return [], []
+    common = os.path.commonpath(lines)
+    first_path = {}
+    for line in lines:
+        first_path.setdefault(os.path.splitext(os.path.basename(line))[0], line)
+
+    source_index = {}
+    for dirpath, _, filenames in os.walk(source_folder):
+        for fname in filenames:
+            source_index.setdefault(os.path.splitext(fname)[0], []).append(os.path.join(dirpath, fname))
+
+    # keyed by destination: when two sources land on the same file the last one wins, as with serial copies
+    jobs, missing = {}, []
+    for base_name, ref_txt_path in first_path.items():
+        if base_name not in source_index:
+            missing.append(base_name)
+            continue
+        dest_dir = os.path.join(destination_root, os.path.dirname(os.path.relpath(ref_txt_path, start=common)))
+        for source_file in source_index[base_name]:
+            jobs[os.path.join(dest_dir, os.path.basename(source_file))] = source_file
+    return [(src, dst) for dst, src in jobs.items()], missing
+
+
+# === PLACING ONE FILE ===
+def _reflink(src, dst):
+    if fcntl is None:
+        raise OSError("reflinks are not supported here")
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+
+
+def _copy_file_range(src, dst):
+    if not hasattr(os, "copy_file_range"):
+        raise OSError("copy_file_range is not available")
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        remaining = os.fstat(fin.fileno()).st_size
+        while remaining > 0:
+            sent = os.copy_file_range(fin.fileno(), fout.fileno(), min(remaining, COPY_CHUNK))
+            if sent == 0:
+                raise OSError("copy_file_range stopped before the end of the file")
+            remaining -= sent
+
+
+def _sendfile(src, dst):
+    if not hasattr(os, "sendfile"):
+        raise OSError("sendfile is not available")
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        size = os.fstat(fin.fileno()).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(fout.fileno(), fin.fileno(), offset, min(size - offset, COPY_CHUNK))
+            if sent == 0:
+                raise OSError("sendfile stopped before the end of the file")
+            offset += sent
+
+
+def _method_order(allow_hardlinks):
+    methods = [("reflink", _reflink)]
+    if allow_hardlinks:
+        methods.append(("hardlink", os.link))
+    methods += [("copy_file_range", _copy_file_range), ("sendfile", _sendfile)]
+    return methods
+
+
+def stage_file(src, dst, allow_hardlinks=False):
+    """Place ``src`` at ``dst`` (replacing it); returns the method that worked.
+
+    Kernel copies get the source's timestamps like shutil.copy2. A hardlink
+    shares the file: editing the destination also changes the source.
+    """
+    src_stat = os.stat(src)
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return "already linked"
+    devices = (src_stat.st_dev, os.stat(os.path.dirname(dst) or ".").st_dev)
+    tmp_path = dst + ".staging"
+    for name, method in _method_order(allow_hardlinks):
+        if name in ("reflink", "hardlink") and devices[0] != devices[1]:
+            continue
+        if name in _failed_methods.get(devices, ()):
+            continue
+        try:
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+            method(src, tmp_path)
+        except OSError as e:
+            if e.errno in UNSUPPORTED_ERRNOS:
+                # unsupported on this pair of filesystems: don't try it again for the next file
+                with _failed_lock:
+                    _failed_methods.setdefault(devices, set()).add(name)
+            continue
+        if name != "hardlink":
+            shutil.copystat(src, tmp_path)
+        os.replace(tmp_path, dst)
+        return name
+
+    try:
+        shutil.copy2(src, tmp_path)
+    except OSError:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, dst)
+    return "copy2"
+
+
+# === PLACING MANY FILES ===
+def stage_files(jobs, workers=DEFAULT_WORKERS, allow_hardlinks=False, verbose=True):
+    """Place every (source, destination) pair with a thread pool; returns a Counter of methods used."""
+    for dest_dir in {os.path.dirname(dst) for _, dst in jobs}:
+        os.makedirs(dest_dir, exist_ok=True)
+
+    def place(job):
+        src, dst = job
+        try:
+            return job, stage_file(src, dst, allow_hardlinks), None
+        except OSError as e:
+            return job, None, e
+
+    counts = Counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for (src, dst), method, error in pool.map(place, jobs):
+            if error:
+                counts["failed"] += 1
+                print(f"[!] Failed: {src} → {dst}: {error}")
+                continue
+            counts[method] += 1
+            if verbose:
+                print(f"Copied ({method}): {src} → {dst}")
+    return counts
@@ -0,0 +1,242 @@
+from collections import namedtuple, OrderedDict
+
+# Groups repeated StaticMesh placements so map reconstruction can spawn one
+# HierarchicalInstancedStaticMeshComponent per (mesh, material overrides)
+# instead of one StaticMeshActor per placement. Nothing here imports unreal;
+# the spawn helper takes the module as an argument so a stand-in can be used:
+#   python -m core.instancing --self-test
+
+Placement = namedtuple("Placement", "name mesh_path overrides location rotation scale")
+InstanceGroup = namedtuple("InstanceGroup", "mesh_path overrides placements")
+
+
+def override_key(props):
+    """Hashable key for a component's OverrideMaterials (empty tuple if none)."""
+    overrides = props.get("OverrideMaterials") or []
+    key = []
+    for entry in overrides:
+        if isinstance(entry, dict):
+            key.append(entry.get("ObjectPath") or entry.get("ObjectName") or None)
+        else:
+            key.append(None)
+    while key and key[-1] is None:
+        key.pop()
+    return tuple(key)
+
+
+def group_placements(placements, min_count):
+    """Split placements into instanced groups and single placements.
+
+    Placements sharing a mesh and material overrides form a group; groups with
+    at least ``min_count`` members are returned as InstanceGroups, everything
+    else comes back in the singles list in its original order.
+    """
+    placements = list(placements)
+    buckets = OrderedDict()
+    for placement in placements:
+        buckets.setdefault((placement.mesh_path, placement.overrides), []).append(placement)
+
+    groups = [InstanceGroup(mesh_path, overrides, members)
+              for (mesh_path, overrides), members in buckets.items()
+              if min_count > 0 and len(members) >= min_count]
+    grouped = {(group.mesh_path, group.overrides) for group in groups}
+    singles = [p for p in placements if (p.mesh_path, p.overrides) not in grouped]
+    return groups, singles
+
+
+def blueprint_asset_path(path):
+    """"/Game/BP/BP_HISM.BP_HISM_C" or "/Game/BP/BP_HISM.BP_HISM" -> "/Game/BP/BP_HISM".
+
+    EditorAssetLibrary.load_blueprint_class wants the Blueprint asset, not its generated class.
+    """
+    return path.split(".", 1)[0] if path else path
+
+
+def load_instance_actor_class(unreal, path):
+    """Load the Blueprint class used for instanced groups; logs and returns None if it can't be loaded."""
+    if not path:
+        return None
+    asset_path = blueprint_asset_path(path)
+    actor_class = unreal.EditorAssetLibrary.load_blueprint_class(asset_path)
+    if not actor_class:
+        print(f"⚠️ Could not load instancing Blueprint {asset_path}; every mesh is placed as its own actor")
+        return None
+    return actor_class
+
+
+def instance_label(group):
+    base = group.mesh_path.rsplit("/", 1)[-1]
+    return f"{base}_HISM_{len(group.placements)}"
+
+
+def spawn_instanced_group(unreal, mesh, group, materials=None, actor_class=None, label=None):
+    """Spawn one ``actor_class`` actor holding every placement of ``group`` as HISM instances.
+
+    ``actor_class`` must have a HierarchicalInstancedStaticMeshComponent (e.g. a
+    project Blueprint with a HISM root): Python can't give a plain Actor a
+    registered root component in UE4.27. Returns the actor, or None if it could
+    not be spawned or filled, so the caller can place the meshes individually.
+    """
+    if actor_class is None:
+        return None
+    origin = unreal.Vector(0.0, 0.0, 0.0)
+    actor = unreal.EditorLevelLibrary.spawn_actor_from_class(actor_class, origin, unreal.Rotator(0.0, 0.0, 0.0))
+    if not actor:
+        return None
+
+    try:
+        components = actor.get_components_by_class(unreal.HierarchicalInstancedStaticMeshComponent)
+        if not components:
+            print(f"❌ {actor_class.get_name()} has no HierarchicalInstancedStaticMeshComponent")
+            unreal.EditorLevelLibrary.destroy_actor(actor)
+            return None
+        hism = components[0]
+        hism.set_editor_property("mobility", unreal.ComponentMobility.MOVABLE)
+        hism.set_static_mesh(mesh)
+        for slot, material in enumerate(materials or []):
+            if material:
+                hism.set_material(slot, material)
+
+        transforms = [unreal.Transform(p.location, p.rotation, p.scale) for p in group.placements]
+        if hasattr(hism, "add_instances"):
+            hism.add_instances(transforms, False)
+        else:
+            for transform in transforms:
+                hism.add_instance(transform)
+
+        actor.set_actor_label(label or instance_label(group))
+    except Exception as e:
+        print(f"❌ Could not fill instanced actor for {group.mesh_path}: {e}")
+        unreal.EditorLevelLibrary.destroy_actor(actor)
+        return None
+    return actor
+
+
+# === SELF-TEST (stand-in unreal module) ===
+def _stand_in_unreal():
+    from types import SimpleNamespace
+
+    class Component:
+        def __init__(self, fail=False):
+            self.fail = fail
+            self.properties, self.materials, self.instances, self.mesh = {}, {}, [], None
+
+        def set_editor_property(self, name, value):
+            self.properties[name] = value
+
+        def set_static_mesh(self, mesh):
+            self.mesh = mesh
+
+        def set_material(self, slot, material):
+            self.materials[slot] = material
+
+        def add_instances(self, transforms, world_space):
+            if self.fail:
+                raise RuntimeError("stand-in failure")
+            self.instances.extend(transforms)
+
+    class HISM(Component):
+        pass
+
+    class Actor:
+        def __init__(self, actor_class):
+            self.components = [HISM(actor_class.fail)] if actor_class.has_hism else []
+            self.label = None
+
+        def get_components_by_class(self, cls):
+            return [c for c in self.components if isinstance(c, cls)]
+
+        def set_actor_label(self, label):
+            self.label = label
+
+    class ActorClass:
+        def __init__(self, name, has_hism=True, fail=False):
+            self.name, self.has_hism, self.fail = name, has_hism, fail
+
+        def get_name(self):
+            return self.name
+
+    class EditorLevelLibrary:
+        spawned, destroyed = [], []
+
+        @classmethod
+        def spawn_actor_from_class(cls, actor_class, location, rotation):
+            actor = Actor(actor_class)
+            cls.spawned.append(actor)
+            return actor
+
+        @classmethod
+        def destroy_actor(cls, actor):
+            cls.destroyed.append(actor)
+
+    class EditorAssetLibrary:
+        blueprints = {"/Game/Blueprints/BP_HISM": ActorClass("BP_HISM_C")}
+        requested = []
+
+        @classmethod
+        def load_blueprint_class(cls, path):
+            cls.requested.append(path)
+            return cls.blueprints.get(path)
+
+    return SimpleNamespace(
+        Vector=lambda *v: tuple(v), Rotator=lambda *v: tuple(v), Transform=lambda *v: tuple(v),
+        ComponentMobility=SimpleNamespace(MOVABLE="MOVABLE"),
+        HierarchicalInstancedStaticMeshComponent=HISM,
+        EditorLevelLibrary=EditorLevelLibrary, EditorAssetLibrary=EditorAssetLibrary,
+        ActorClass=ActorClass,
+    )
+
+
+def self_test():
+    """Group and spawn against a stand-in unreal module; raises AssertionError on a wrong result."""
+    assert override_key({"OverrideMaterials": [{"ObjectPath": "/Game/M_A.M_A"}, None, None]}) == ("/Game/M_A.M_A",)
+    assert override_key({}) == ()
+
+    def place(i, mesh, overrides=()):
+        return Placement(f"P{i}", mesh, overrides, (i, 0, 0), (0, 0, 0), (1, 1, 1))
+
+    placements = [place(0, "/Game/Chair"), place(1, "/Game/Table"), place(2, "/Game/Chair"),
+                  place(3, "/Game/Chair", ("/Game/M_Red",)), place(4, "/Game/Chair")]
+    groups, singles = group_placements(placements, 3)
+    assert [(g.mesh_path, [p.name for p in g.placements]) for g in groups] == [("/Game/Chair", ["P0", "P2", "P4"])]
+    assert [p.name for p in singles] == ["P1", "P3"], singles
+    groups, singles = group_placements(placements, 0)
+    assert groups == [] and singles == placements
+    print("✅ group_placements")
+
+    unreal = _stand_in_unreal()
+    assert blueprint_asset_path("/Game/Blueprints/BP_HISM.BP_HISM_C") == "/Game/Blueprints/BP_HISM"
+    actor_class = load_instance_actor_class(unreal, "/Game/Blueprints/BP_HISM.BP_HISM_C")
+    assert actor_class is not None and unreal.EditorAssetLibrary.requested == ["/Game/Blueprints/BP_HISM"]
+    assert load_instance_actor_class(unreal, "/Game/Missing/BP_Nope") is None
+    assert load_instance_actor_class(unreal, None) is None
+    print("✅ load_instance_actor_class")
+
+    group = group_placements(placements, 3)[0][0]
+    actor = spawn_instanced_group(unreal, "ChairMesh", group, ["M_Chair"], actor_class)
+    hism = actor.components[0]
+    assert hism.mesh == "ChairMesh" and hism.materials == {0: "M_Chair"}
+    assert hism.properties["mobility"] == "MOVABLE"
+    assert [t[0] for t in hism.instances] == [(0, 0, 0), (2, 0, 0), (4, 0, 0)]
+    assert actor.label == "Chair_HISM_3", actor.label
+
+    library = unreal.EditorLevelLibrary
+    assert spawn_instanced_group(unreal, "ChairMesh", group, None, None) is None
+    no_hism = unreal.ActorClass("BP_Empty_C", has_hism=False)
+    assert spawn_instanced_group(unreal, "ChairMesh", group, None, no_hism) is None
+    assert library.destroyed[-1] is library.spawned[-1]
+    failing = unreal.ActorClass("BP_Broken_C", fail=True)
+    assert spawn_instanced_group(unreal, "ChairMesh", group, None, failing) is None
+    assert library.destroyed[-1] is library.spawned[-1]
+    assert len(library.destroyed) == 2
+    print("✅ spawn_instanced_group")
+    print("🏁 instancing self-test passed")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if "--self-test" in sys.argv:
+        self_test()
+    else:
+        print("Usage: python -m core.instancing --self-test")
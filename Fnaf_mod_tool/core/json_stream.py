@@ -0,0 +1,131 @@
+import re
+import json
+
+# Incremental reader for FModel JSON exports.
+# A map export is one big top-level array of export objects; this yields them
+# one at a time so only a single object is ever held in memory.
+
+CHUNK_SIZE = 1 << 20
+
+_STRUCTURE = re.compile(r'[{}\[\]"]')
+_STRING_TAIL = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+_NON_WS = re.compile(r"\S")
+
+
+def _filter_keys(obj, keys, property_keys):
+    if not isinstance(obj, dict):
+        return obj
+    if keys is not None:
+        obj = {k: v for k, v in obj.items() if k in keys}
+    if property_keys is not None and isinstance(obj.get("Properties"), dict):
+        obj["Properties"] = {k: v for k, v in obj["Properties"].items() if k in property_keys}
+    return obj
+
+
+def _scalars(gap):
+    """Numbers, true/false/null between top-level array elements (``gap`` is the text between them)."""
+    for token in gap.split(","):
+        token = token.strip()
+        if token:
+            yield json.loads(token)
+
+
+def iter_exports(path, keys=None, property_keys=None, chunk_size=CHUNK_SIZE):
+    """Yield each top-level export object of an FModel JSON file.
+
+    ``keys`` limits which top-level fields of each export are kept and
+    ``property_keys`` does the same for its "Properties" dict; anything not
+    requested is dropped as soon as the export is decoded. Strings, numbers,
+    true/false/null elements of the array are yielded as they are. A file
+    whose root is not an array yields its root value once.
+    """
+    if keys is not None:
+        keys = set(keys)
+    if property_keys is not None:
+        property_keys = set(property_keys)
+
+    with open(path, "r", encoding="utf-8-sig") as f:
+        buf = f.read(chunk_size)
+        first = _NON_WS.search(buf)
+        while first is None:
+            more = f.read(chunk_size)
+            if not more:
+                return
+            buf += more
+            first = _NON_WS.search(buf)
+
+        if buf[first.start()] != "[":
+            rest = f.read()
+            yield _filter_keys(json.loads(buf + rest), keys, property_keys)
+            return
+
+        decoder = json.JSONDecoder()
+        pos = first.start() + 1
+        gap_start = pos  # end of the last top-level element; scalars sit between here and the next one
+        start = -1
+        depth = 0
+        eof = False
+
+        while True:
+            match = _STRUCTURE.search(buf, pos)
+            if match is None:
+                if eof:
+                    break
+                pos = len(buf)
+            else:
+                ch = match.group()
+                pos = match.end()
+                if depth == 0:
+                    yield from _scalars(buf[gap_start:match.start()])
+                    gap_start = match.start()
+                if ch == '"':
+                    tail = _STRING_TAIL.match(buf, pos)
+                    if tail is None:
+                        # string runs past the end of the buffer
+                        pos = match.start()
+                        match = None
+                        if eof:
+                            raise ValueError(f"Unterminated string in {path}")
+                    else:
+                        pos = tail.end()
+                        if depth == 0:
+                            # bare string element in the top-level array
+                            yield json.loads(match.group() + tail.group())
+                            gap_start = pos
+                        continue
+                elif ch in "{[":
+                    if depth == 0:
+                        start = match.start()
+                    depth += 1
+                    continue
+                elif ch in "}]":
+                    if depth == 0:
+                        return
+                    depth -= 1
+                    if depth == 0:
+                        obj, _ = decoder.raw_decode(buf, start)
+                        yield _filter_keys(obj, keys, property_keys)
+                        start = -1
+                        gap_start = pos
+                    continue
+
+            if match is None:
+                if eof:
+                    break
+                # keep only the unfinished export in memory
+                keep_from = start if depth else gap_start
+                buf = buf[keep_from:]
+                if depth:
+                    start = 0
+                else:
+                    gap_start = 0
+                pos -= keep_from
+                more = f.read(chunk_size)
+                if not more:
+                    eof = True
+                buf += more
+
+        if depth:
+            raise ValueError(f"Truncated JSON array in {path}")
+        yield from _scalars(buf[gap_start:])
+
@@ -0,0 +1,74 @@
+import os
+import json
+import math
+from collections import OrderedDict
+
+# Splits a compiled spawn plan (core.spawn_plan) into square XY grid cells for
+# sharded reconstruction. Each cell becomes its own level built by a separate
+# editor process, then a World Composition persistent level picks the cells up
+# as tiles. Cells are addressed by the export indices of their plan entries, so
+# every worker replays the same plan file.
+
+DEFAULT_CELL_SIZE = 10000.0  # 100 m, in Unreal units
+SHARD_JOB_ENV = "FNAF_MAP_SHARD"
+
+
+def cell_for(location, cell_size):
+    return (int(math.floor(location[0] / cell_size)), int(math.floor(location[1] / cell_size)))
+
+
+def cell_suffix(cell):
+    # Asset names can't contain "-": cell (-2, 3) becomes "Xn2_Y3"
+    def part(value):
+        return f"n{-value}" if value < 0 else str(value)
+    return f"X{part(cell[0])}_Y{part(cell[1])}"
+
+
+def partition_plan(plan, cell_size=DEFAULT_CELL_SIZE):
+    """Return an OrderedDict {cell: [export index, ...]} sorted by cell.
+
+    An export is placed by its first plan entry (a BlockingVolume's hull parts
+    all share the volume's location).
+    """
+    cells = {}
+    seen = set()
+    for section in (plan.lights, plan.brushes, plan.meshes, plan.actors):
+        for entry in section:
+            if entry.index in seen:
+                continue
+            seen.add(entry.index)
+            cells.setdefault(cell_for(entry.location, cell_size), []).append(entry.index)
+    return OrderedDict((cell, sorted(indices)) for cell, indices in sorted(cells.items()))
+
+
+def assign_cells(cells, workers):
+    """Spread cells over ``workers`` lists, biggest cells first onto the lightest worker."""
+    buckets = [[] for _ in range(max(1, workers))]
+    loads = [0] * len(buckets)
+    for cell, indices in sorted(cells.items(), key=lambda item: -len(item[1])):
+        lightest = loads.index(min(loads))
+        buckets[lightest].append(cell)
+        loads[lightest] += len(indices)
+    return [bucket for bucket in buckets if bucket]
+
+
+def write_shard_job(path, job):
+    """Write a job for SBMapReconstuctV5 running with SHARD_JOB_ENV set.
+
+    Cell jobs look like {"plan_path", "cells": [{"level", "indices"}]}; the
+    final job is {"persistent", "cells_dir", "sublevels": [level, ...]}.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(job, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_shard_job():
+    """The shard job an editor process was started with, or None."""
+    path = os.environ.get(SHARD_JOB_ENV)
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,161 @@
+from collections import OrderedDict
+
+# Parameterized master materials for the material generators.
+# Instead of one compiled Material per FModel JSON, a handful of masters (one
+# per combination of texture roles and sampler types) are built once and every
+# JSON becomes a MaterialInstanceConstant that only sets texture parameters.
+# Role/sampler logic is plain Python; the helpers that touch the editor take
+# the unreal module as an argument.
+
+# role -> master parameter name and the (output, material property) links
+ROLES = OrderedDict([
+    ("base_color", ("BaseColor", [("RGB", "MP_BASE_COLOR")])),
+    ("normal", ("Normal", [("RGB", "MP_NORMAL")])),
+    ("orm", ("ORM", [("R", "MP_AMBIENT_OCCLUSION"), ("G", "MP_ROUGHNESS"), ("B", "MP_METALLIC")])),
+    ("ao", ("AO", [("R", "MP_AMBIENT_OCCLUSION")])),
+    ("roughness", ("Roughness", [("R", "MP_ROUGHNESS")])),
+    ("metallic", ("Metallic", [("R", "MP_METALLIC")])),
+    ("specular", ("Specular", [("R", "MP_SPECULAR")])),
+    ("emissive", ("Emissive", [("RGB", "MP_EMISSIVE_COLOR")])),
+    # same wiring as the non-instance generator's 'displacement' parameter
+    ("displacement", ("Displacement", [("R", "MP_WORLD_POSITION_OFFSET")])),
+])
+
+# exact FModel parameter names first, then substring hints (checked in order)
+EXACT_ROLE_NAMES = {
+    "albedo": "base_color", "basecolor": "base_color", "base color": "base_color",
+    "diffuse": "base_color", "color": "base_color", "bsm": "base_color",
+    "normal": "normal", "normalmap": "normal", "nrm": "normal",
+    "orm": "orm", "packed": "orm",
+    "ao": "ao", "ambientocclusion": "ao",
+    "roughness": "roughness", "metallic": "metallic", "specular": "specular",
+    "emissive": "emissive", "emission": "emissive",
+    "displacement": "displacement",
+}
+ROLE_HINTS = [
+    ("normal", "normal"), ("orm", "orm"), ("emissive", "emissive"),
+    ("basecolor", "base_color"), ("albedo", "base_color"), ("diffuse", "base_color"),
+    ("rough", "roughness"), ("metal", "metallic"), ("spec", "specular"),
+    ("occlusion", "ao"), ("displace", "displacement"),
+]
+
+# sampler type -> suffix used in master names (default samplers add nothing)
+SAMPLER_SUFFIX = {
+    "COLOR": "", "NORMAL": "", "LINEAR_COLOR": "Lin", "MASKS": "Mask",
+    "GRAYSCALE": "Gray", "LINEAR_GRAYSCALE": "LinGray", "ALPHA": "Alpha",
+}
+
+
+def classify_param(param_name):
+    """Return the role for an FModel texture parameter name, or None."""
+    name = param_name.strip().lower()
+    if name in EXACT_ROLE_NAMES:
+        return EXACT_ROLE_NAMES[name]
+    compact = name.replace(" ", "").replace("_", "")
+    if compact in EXACT_ROLE_NAMES:
+        return EXACT_ROLE_NAMES[compact]
+    for hint, role in ROLE_HINTS:
+        if hint in compact:
+            return role
+    return None
+
+
+def master_key(role_samplers):
+    """Canonical key for a {role: sampler type name} layout."""
+    return tuple((role, role_samplers[role]) for role in ROLES if role in role_samplers)
+
+
+def master_name(key):
+    parts = [ROLES[role][0] + SAMPLER_SUFFIX.get(sampler, sampler.title()) for role, sampler in key]
+    return "M_Master_" + "_".join(parts)
+
+
+def sampler_type_name(unreal, texture):
+    """Sampler type a TextureSample needs for ``texture`` (mirrors the editor's check)."""
+    compression = texture.get_editor_property("compression_settings")
+    settings = unreal.TextureCompressionSettings
+    srgb = texture.get_editor_property("srgb")
+    if compression == settings.TC_NORMALMAP:
+        return "NORMAL"
+    if compression == settings.TC_MASKS:
+        return "MASKS"
+    if compression == settings.TC_ALPHA:
+        return "ALPHA"
+    if compression == settings.TC_GRAYSCALE:
+        return "GRAYSCALE" if srgb else "LINEAR_GRAYSCALE"
+    return "COLOR" if srgb else "LINEAR_COLOR"
+
+
+class MasterMaterialLibrary:
+    # Creates (or loads from a previous run) one master per layout key.
+    def __init__(self, unreal, folder):
+        self.unreal = unreal
+        self.folder = folder
+        self.masters = {}
+
+    def get(self, key, sample_textures):
+        """Return the master for ``key``; ``sample_textures`` ({role: texture})
+        become the parameter defaults if the master has to be built."""
+        if key in self.masters:
+            return self.masters[key]
+
+        unreal = self.unreal
+        name = master_name(key)
+        path = f"{self.folder}/{name}"
+        if unreal.EditorAssetLibrary.does_asset_exist(path):
+            master = unreal.EditorAssetLibrary.load_asset(path)
+        else:
+            master = self._build(name, key, sample_textures)
+        self.masters[key] = master
+        return master
+
+    def _build(self, name, key, sample_textures):
+        unreal = self.unreal
+        lib = unreal.MaterialEditingLibrary
+        if not unreal.EditorAssetLibrary.does_directory_exist(self.folder):
+            unreal.EditorAssetLibrary.make_directory(self.folder)
+
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        master = asset_tools.create_asset(name, self.folder, unreal.Material, unreal.MaterialFactoryNew())
+        if not master:
+            unreal.log_error(f"Failed to create master material: {name}")
+            return None
+
+        y_pos = 0
+        for role, sampler in key:
+            param_name, links = ROLES[role]
+            node = lib.create_material_expression(master, unreal.MaterialExpressionTextureSampleParameter2D, -384, y_pos)
+            node.set_editor_property("parameter_name", param_name)
+            node.set_editor_property("texture", sample_textures[role])
+            node.set_editor_property("sampler_type", getattr(unreal.MaterialSamplerType, "SAMPLERTYPE_" + sampler))
+            for output, prop in links:
+                lib.connect_material_property(node, output, getattr(unreal.MaterialProperty, prop))
+            y_pos += 250
+
+        lib.layout_material_expressions(master)
+        # The only shader compile in instance mode: once per master layout
+        lib.recompile_material(master)
+        unreal.EditorAssetLibrary.save_loaded_asset(master)
+        unreal.log(f"🏗️ Created master material '{name}'")
+        return master
+
+
+def create_material_instance(unreal, name, folder, master, role_textures, save=True):
+    """Create a MaterialInstanceConstant of ``master`` with its texture parameters set.
+
+    With ``save=False`` the caller is responsible for saving the instance.
+    """
+    asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+    factory = unreal.MaterialInstanceConstantFactoryNew()
+    instance = asset_tools.create_asset(name, folder, unreal.MaterialInstanceConstant, factory)
+    if not instance:
+        unreal.log_error(f"Failed to create material instance: {name}")
+        return None
+
+    lib = unreal.MaterialEditingLibrary
+    lib.set_material_instance_parent(instance, master)
+    for role, texture in role_textures.items():
+        lib.set_material_instance_texture_parameter_value(instance, ROLES[role][0], texture)
+    if save:
+        unreal.EditorAssetLibrary.save_loaded_asset(instance)
+    return instance
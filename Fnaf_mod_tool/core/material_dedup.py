@@ -0,0 +1,123 @@
+import os
+import json
+
+# Collapses generated materials that wire the same textures the same way.
+# A signature is the sorted set of (slot role, texture object path, sampler
+# type) a material would be built from; the first name seen for a signature
+# is built, later names become aliases of it. Aliases keep their own
+# signature: when a built material's textures change, the aliases that no
+# longer match it are dropped and handed back so their JSONs get processed
+# again. The alias file is read back by the mesh material assignment step.
+
+ALIAS_FILE_NAME = "material_aliases.json"
+
+
+def material_signature(slots):
+    """Canonical signature for an iterable of (role, texture path, sampler) triples."""
+    return tuple(sorted((str(role), str(path), str(sampler)) for role, path, sampler in slots))
+
+
+class MaterialDedup:
+    def __init__(self, path):
+        self.path = path
+        self.by_signature = {}
+        self.signatures = {}
+        self.aliases = {}
+        self.alias_signatures = {}
+        self.sources = {}  # material name -> JSON file it came from
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable material alias file {self.path}: {e}")
+            return
+        for name, slots in data.get("signatures", {}).items():
+            signature = material_signature(slots)
+            self.signatures[name] = signature
+            self.by_signature.setdefault(signature, name)
+        self.aliases.update(data.get("aliases", {}))
+        for name, slots in data.get("alias_signatures", {}).items():
+            self.alias_signatures[name] = material_signature(slots)
+        self.sources.update(data.get("sources", {}))
+
+    def canonical_for(self, signature):
+        return self.by_signature.get(signature) if signature else None
+
+    def _forget_signature(self, name):
+        old = self.signatures.pop(name, None)
+        if old is not None and self.by_signature.get(old) == name:
+            del self.by_signature[old]
+
+    def _orphan_aliases(self, canonical, signature=None):
+        """Drop the aliases of ``canonical`` that don't have ``signature``; returns their names."""
+        orphans = [alias for alias, target in self.aliases.items()
+                   if target == canonical and (signature is None or self.alias_signatures.get(alias) != signature)]
+        for alias in orphans:
+            self.drop_alias(alias)
+        return orphans
+
+    def add(self, name, signature, source=None):
+        """Record ``name`` as built from ``signature`` (it stops being an alias).
+
+        Returns the aliases of ``name`` that were dropped because its textures
+        changed; they need to be processed again.
+        """
+        self.drop_alias(name)
+        if source:
+            self.sources[name] = source
+        if not signature:
+            return self._orphan_aliases(name)
+        orphans = []
+        if self.signatures.get(name) != signature:
+            self._forget_signature(name)
+            orphans = self._orphan_aliases(name, signature)
+        self.signatures[name] = signature
+        self.by_signature.setdefault(signature, name)
+        return orphans
+
+    def add_alias(self, alias, canonical, signature, source=None):
+        """Record ``alias`` as using ``canonical``'s material (it is no longer built itself).
+
+        Returns the aliases that pointed at ``alias`` and were dropped with it.
+        """
+        self._forget_signature(alias)
+        orphans = self._orphan_aliases(alias)
+        self.aliases[alias] = canonical
+        self.alias_signatures[alias] = signature
+        if source:
+            self.sources[alias] = source
+        return orphans
+
+    def drop_alias(self, alias):
+        self.aliases.pop(alias, None)
+        self.alias_signatures.pop(alias, None)
+
+    def save(self):
+        data = {
+            "signatures": {name: [list(slot) for slot in sig] for name, sig in sorted(self.signatures.items())},
+            "aliases": dict(sorted(self.aliases.items())),
+            "alias_signatures": {name: [list(slot) for slot in sig]
+                                 for name, sig in sorted(self.alias_signatures.items())},
+            "sources": dict(sorted(self.sources.items())),
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def load_material_aliases(path):
+    """Return {alias name: built material name} from an alias file (empty if missing)."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("aliases", {})
+    except Exception as e:
+        print(f"⚠️ Could not read material aliases from {path}: {e}")
+        return {}
@@ -0,0 +1,335 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Small incremental build runner for the FModel -> UE pipeline.
+# Each Step declares the files/folders it reads and writes; a step runs after
+# every step whose outputs contain one of its inputs, plus any steps named in
+# ``after`` (ordering only) or ``invalidated_by``. A step is redone only when
+# the content hash of one of its inputs changed since its last successful run,
+# an output is missing, or one of its ``invalidated_by`` steps (work the hashes
+# can't see, like assets written into the UE project) did work in this
+# invocation. The step is told which input
+# files changed so it can limit itself to those. Independent steps run in
+# parallel; steps sharing a ``lock`` (e.g. everything that opens the editor)
+# never overlap.
+
+STAMP_VERSION = 1
+HASH_CHUNK = 1024 * 1024
+
+# Editor scripts launched by the pipeline read their file list from here
+FILE_LIST_ENV = "FNAF_PIPELINE_FILES"
+
+
+def pipeline_files():
+    """Files handed to an editor script by the pipeline, or None for a normal run."""
+    list_path = os.environ.get(FILE_LIST_ENV)
+    if not list_path or not os.path.exists(list_path):
+        return None
+    with open(list_path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def write_file_list(path, files):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(files))
+    return path
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _norm(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _is_under(path, root):
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+class StepContext:
+    # What a step's run function gets: every input file plus what changed
+    def __init__(self, step, files, changed, removed, forced):
+        self.step = step
+        self.files = files
+        self.changed = changed
+        self.removed = removed
+        # True when the whole step must be redone (no stamp, missing output,
+        # an ``invalidated_by`` step did work, or --force), not just the changed files
+        self.forced = forced
+
+
+class Step:
+    def __init__(self, name, run, inputs=(), outputs=(), extensions=None, exclude=(),
+                 after=(), invalidated_by=(), lock=None, restamp=False):
+        """``run(ctx)`` returns True on success (None counts as success).
+
+        ``inputs``/``outputs`` are files or folders; folders are walked and,
+        if ``extensions`` is given, only files with those extensions count.
+        Files named in ``exclude`` (e.g. state the step writes next to its
+        inputs) are never inputs. ``restamp`` is for steps that move or
+        rewrite their own inputs: the inputs are hashed again after the step
+        ran, so the next run doesn't see its own changes as new work.
+        """
+        self.name = name
+        self.run = run
+        self.inputs = [_norm(p) for p in inputs]
+        self.outputs = [_norm(p) for p in outputs]
+        self.extensions = tuple(e.lower() for e in extensions) if extensions else None
+        self.exclude = {name.lower() for name in exclude}
+        self.after = list(after)
+        self.invalidated_by = list(invalidated_by)
+        self.lock = lock
+        self.restamp = restamp
+
+    def input_files(self):
+        files = []
+        for path in self.inputs:
+            if os.path.isdir(path):
+                for root, _, names in os.walk(path):
+                    for name in names:
+                        if name.lower() in self.exclude:
+                            continue
+                        if self.extensions is None or name.lower().endswith(self.extensions):
+                            files.append(os.path.join(root, name))
+            elif os.path.isfile(path):
+                files.append(path)
+        return sorted(files)
+
+    def reads(self, path):
+        """True if ``path`` (another step's output) is, or contains, one of our inputs."""
+        for input_path in self.inputs:
+            if _is_under(input_path, path):
+                return True
+            if _is_under(path, input_path):
+                # a file output inside an input folder only counts if it passes the filter
+                if self.extensions and os.path.splitext(path)[1] and not path.lower().endswith(self.extensions):
+                    continue
+                if os.path.basename(path).lower() in self.exclude:
+                    continue
+                return True
+        return False
+
+    def missing_outputs(self):
+        return [p for p in self.outputs if not os.path.exists(p)]
+
+
+class Pipeline:
+    def __init__(self, steps, stamp_file, jobs=None, log=print):
+        self.steps = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate step name: {step.name}")
+            self.steps[step.name] = step
+        self.stamp_file = stamp_file
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.log = log
+        self.deps = self._build_deps()
+        self._stamp_lock = threading.Lock()
+        self._locks = {step.lock: threading.Lock() for step in steps if step.lock}
+        self.stamps = self._load_stamps()
+
+    # === GRAPH ===
+    def _build_deps(self):
+        deps = {name: set() for name in self.steps}
+        for step in self.steps.values():
+            for other in self.steps.values():
+                if other is step:
+                    continue
+                if any(step.reads(o) for o in other.outputs):
+                    deps[step.name].add(other.name)
+            for name in step.after + step.invalidated_by:
+                if name not in self.steps:
+                    raise ValueError(f"Step {step.name} runs after unknown step {name}")
+                deps[step.name].add(name)
+        self._check_cycles(deps)
+        return deps
+
+    def _check_cycles(self, deps):
+        state = {}
+
+        def visit(name, chain):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError("Pipeline cycle: " + " -> ".join(chain + [name]))
+            state[name] = "visiting"
+            for dep in sorted(deps[name]):
+                visit(dep, chain + [name])
+            state[name] = "done"
+
+        for name in self.steps:
+            visit(name, [])
+
+    def _with_dependencies(self, targets):
+        wanted = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.steps:
+                raise ValueError(f"Unknown step: {name}")
+            if name not in wanted:
+                wanted.add(name)
+                stack.extend(self.deps[name])
+        return wanted
+
+    # === STAMPS ===
+    def _load_stamps(self):
+        if os.path.exists(self.stamp_file):
+            try:
+                with open(self.stamp_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == STAMP_VERSION:
+                    return data
+            except Exception as e:
+                self.log(f"⚠️ Ignoring unreadable pipeline stamps {self.stamp_file}: {e}")
+        return {"version": STAMP_VERSION, "hashes": {}, "steps": {}}
+
+    def _save_stamps(self):
+        tmp_path = self.stamp_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stamps, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.stamp_file)
+
+    def _hash(self, path):
+        # Content hash, re-read only when size or mtime moved
+        st = os.stat(path)
+        with self._stamp_lock:
+            cached = self.stamps["hashes"].get(path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        digest = file_hash(path)
+        with self._stamp_lock:
+            self.stamps["hashes"][path] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    # === PLANNING ===
+    def _input_hashes(self, step):
+        hashes = {}
+        for path in step.input_files():
+            try:
+                hashes[path] = self._hash(path)
+            except OSError:
+                continue
+        return hashes
+
+    def check(self, step, invalidated=False, force=False):
+        """Return (StepContext, hashes, reason) or (None, hashes, None) if up to date."""
+        hashes = self._input_hashes(step)
+        with self._stamp_lock:
+            previous = self.stamps["steps"].get(step.name, {}).get("inputs")
+
+        changed = [p for p in sorted(hashes) if previous is None or previous.get(p) != hashes[p]]
+        removed = sorted(set(previous or ()) - set(hashes))
+        missing = step.missing_outputs()
+
+        forced = True
+        if force:
+            reason = "forced"
+        elif previous is None:
+            reason = "never ran"
+        elif missing:
+            reason = f"missing output {missing[0]}"
+        elif invalidated:
+            reason = "a step it depends on did work"
+        elif changed or removed:
+            reason = f"{len(changed)} changed, {len(removed)} removed input files"
+            forced = False
+        else:
+            return None, hashes, None
+        return StepContext(step, sorted(hashes), changed, removed, forced), hashes, reason
+
+    def _stamp(self, step, hashes):
+        with self._stamp_lock:
+            self.stamps["steps"][step.name] = {"inputs": hashes, "finished": time.time()}
+            self._save_stamps()
+
+    # === RUN ===
+    def _execute(self, step, ctx):
+        lock = self._locks.get(step.lock)
+        if lock:
+            lock.acquire()
+        try:
+            start = time.time()
+            result = step.run(ctx)
+            return result is None or bool(result), time.time() - start
+        finally:
+            if lock:
+                lock.release()
+
+    def run(self, targets=None, force=False, dry_run=False):
+        """Run ``targets`` (default: every step) and what they depend on.
+
+        Returns {step name: "ran" | "up to date" | "failed" | "skipped" | "would run"}.
+        """
+        wanted = self._with_dependencies(targets or list(self.steps))
+        status = {}
+        did_work = set()
+        pending = set(wanted)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                for name in sorted(pending):
+                    deps = self.deps[name] & wanted
+                    if any(d not in status for d in deps):
+                        continue
+                    pending.discard(name)
+                    step = self.steps[name]
+                    if any(status[d] in ("failed", "skipped") for d in deps):
+                        status[name] = "skipped"
+                        self.log(f"⏭️ {name}: skipped, an upstream step failed")
+                        continue
+
+                    invalidated = any(d in did_work for d in step.invalidated_by)
+                    ctx, hashes, reason = self.check(step, invalidated, force)
+                    if ctx is None and dry_run and any(d in did_work for d in deps):
+                        # upstream outputs haven't been written yet, so hashes can't tell
+                        status[name] = "would run"
+                        did_work.add(name)
+                        self.log(f"📝 {name}: would run (after upstream work)")
+                        continue
+                    if ctx is None:
+                        status[name] = "up to date"
+                        self.log(f"✅ {name}: up to date")
+                        continue
+                    if dry_run:
+                        status[name] = "would run"
+                        did_work.add(name)
+                        self.log(f"📝 {name}: would run ({reason})")
+                        continue
+
+                    self.log(f"🚀 {name}: running ({reason})")
+                    running[pool.submit(self._execute, step, ctx)] = (name, hashes)
+
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, hashes = running.pop(future)
+                    try:
+                        ok, seconds = future.result()
+                        error = "" if ok else "step reported failure"
+                    except Exception as e:
+                        ok, seconds, error = False, 0.0, f"{type(e).__name__}: {e}"
+                    if ok:
+                        step = self.steps[name]
+                        self._stamp(step, self._input_hashes(step) if step.restamp else hashes)
+                        status[name] = "ran"
+                        did_work.add(name)
+                        self.log(f"✅ {name}: done in {seconds:.1f}s")
+                    else:
+                        status[name] = "failed"
+                        self.log(f"❌ {name}: {error}")
+
+        with self._stamp_lock:
+            self._save_stamps()
+        return status
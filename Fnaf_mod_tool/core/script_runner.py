@@ -0,0 +1,107 @@
+import os
+import time
+import queue
+import threading
+import subprocess
+
+# Runs launcher commands one after another on a background thread.
+# Output is read line by line from stdout and stderr and posted, with a
+# timestamp, to a queue.Queue the GUI drains from its own thread. Nothing here
+# touches tkinter, so the runner can be driven from a plain script too.
+#
+# Events put on the queue (all tuples, first item is the kind):
+#   ("start", timestamp, name, cmd)
+#   ("line", timestamp, name, stream, text)    stream is "stdout" or "stderr"
+#   ("exit", timestamp, name, returncode, seconds)   returncode None = cancelled
+#   ("error", timestamp, name, message)        the process could not be started
+#   ("done", timestamp, results)               results: [(name, returncode), ...]
+
+KILL_GRACE_SECONDS = 5
+POLL_SECONDS = 0.2  # how quickly the runner thread notices cancel()
+
+
+class ScriptRunner:
+    def __init__(self, events=None):
+        self.events = events if events is not None else queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, jobs):
+        """Run ``jobs`` ([(name, cmd), ...]) in order on a background thread."""
+        if self.running:
+            raise RuntimeError("A run is already in progress")
+        self._cancel.clear()
+        self._thread = threading.Thread(target=self._run, args=(list(jobs),), daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop the current process and skip the remaining jobs.
+
+        Returns at once; the runner thread terminates the process (and kills
+        it if it is still alive after KILL_GRACE_SECONDS).
+        """
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _post(self, kind, *data):
+        self.events.put((kind, time.time()) + data)
+
+    def _pump(self, name, stream_name, pipe):
+        for line in iter(pipe.readline, ""):
+            self._post("line", name, stream_name, line.rstrip("\r\n"))
+        pipe.close()
+
+    def _wait_process(self, process):
+        while not self._cancel.is_set():
+            try:
+                return process.wait(POLL_SECONDS)
+            except subprocess.TimeoutExpired:
+                pass
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(KILL_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        return process.wait()
+
+    def _run(self, jobs):
+        results = []
+        for name, cmd in jobs:
+            if self._cancel.is_set():
+                break
+            self._post("start", name, cmd)
+            started = time.time()
+            env = dict(os.environ, PYTHONIOENCODING="utf-8", PYTHONUNBUFFERED="1")
+            try:
+                process = subprocess.Popen(
+                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                    encoding="utf-8", errors="replace", bufsize=1, env=env)
+            except Exception as e:
+                self._post("error", name, str(e))
+                results.append((name, None))
+                continue
+
+            pumps = [
+                threading.Thread(target=self._pump, args=(name, "stdout", process.stdout), daemon=True),
+                threading.Thread(target=self._pump, args=(name, "stderr", process.stderr), daemon=True),
+            ]
+            for pump in pumps:
+                pump.start()
+            returncode = self._wait_process(process)
+            for pump in pumps:
+                pump.join()
+
+            if self._cancel.is_set():
+                returncode = None
+            self._post("exit", name, returncode, time.time() - started)
+            results.append((name, returncode))
+
+        self._post("done", results)
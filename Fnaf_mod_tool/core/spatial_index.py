@@ -0,0 +1,154 @@
+import math
+
+from core.json_stream import iter_exports
+from core.map_partition import DEFAULT_CELL_SIZE
+
+# Uniform-grid spatial index over the exports of a map JSON.
+# Every export gets an axis-aligned box (its location, grown by the convex
+# hull of a BlockingVolume); boxes are stored in every XY grid cell they touch.
+# Meshes, lights and other actors are indexed as points: a large mesh is only
+# found by a region that contains its origin. The grid uses the same cell
+# size as the sharded reconstruction (core.map_partition).
+# Queries take a box or a center + radius and return export indices, so
+# SBMapReconstuctV5 can spawn just one area and the counts can be checked
+# without the editor:
+#   python -m core.spatial_index Map.json --center 1000 -2500 0 --radius 5000
+
+BOUNDS_KEYS = ("Type", "Name", "RelativeLocation", "Properties")
+BOUNDS_PROPERTY_KEYS = ("RelativeLocation", "RelativeScale3D", "BodySetup")
+
+
+def export_bounds(obj):
+    """(min xyz, max xyz) of an export.
+
+    A point at its location unless it carries convex geometry (BlockingVolume
+    hulls); mesh extents are not known here, so meshes are points too.
+    """
+    props = obj.get("Properties") or {}
+    location = obj.get("RelativeLocation") or props.get("RelativeLocation") or {}
+    x, y, z = (float(location.get(k, 0.0)) for k in ("X", "Y", "Z"))
+
+    # BlockingVolume hulls: the largest scaled vertex distance bounds any rotation
+    reach = 0.0
+    body = props.get("BodySetup")
+    if isinstance(body, dict):
+        scale = props.get("RelativeScale3D") or {}
+        sx, sy, sz = (abs(float(scale.get(k, 1.0))) for k in ("X", "Y", "Z"))
+        for convex in (body.get("AggGeom") or {}).get("ConvexElems") or []:
+            for v in convex.get("VertexData") or []:
+                d = math.sqrt((v.get("X", 0) * sx) ** 2 + (v.get("Y", 0) * sy) ** 2 + (v.get("Z", 0) * sz) ** 2)
+                reach = max(reach, d)
+    return (x - reach, y - reach, z - reach), (x + reach, y + reach, z + reach)
+
+
+def _boxes_overlap(a_min, a_max, b_min, b_max):
+    return all(a_min[i] <= b_max[i] and b_min[i] <= a_max[i] for i in range(3))
+
+
+def _box_sphere_overlap(b_min, b_max, center, radius):
+    dist2 = 0.0
+    for i in range(3):
+        nearest = min(max(center[i], b_min[i]), b_max[i])
+        dist2 += (center[i] - nearest) ** 2
+    return dist2 <= radius * radius
+
+
+class GridIndex:
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        self.bounds = []
+        self.types = []
+
+    def _cell_range(self, b_min, b_max):
+        size = self.cell_size
+        x0, x1 = int(math.floor(b_min[0] / size)), int(math.floor(b_max[0] / size))
+        y0, y1 = int(math.floor(b_min[1] / size)), int(math.floor(b_max[1] / size))
+        return ((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+
+    def insert(self, b_min, b_max, obj_type=""):
+        """Add a box; returns its index (the export's position in the JSON)."""
+        index = len(self.bounds)
+        self.bounds.append((b_min, b_max))
+        self.types.append(obj_type)
+        for cell in self._cell_range(b_min, b_max):
+            self.cells.setdefault(cell, []).append(index)
+        return index
+
+    def _candidates(self, q_min, q_max):
+        seen = set()
+        for cell in self._cell_range(q_min, q_max):
+            for index in self.cells.get(cell, ()):
+                if index not in seen:
+                    seen.add(index)
+                    yield index
+
+    def query_box(self, q_min, q_max):
+        """Sorted indices of exports whose bounds intersect the box (corners in either order)."""
+        q_min, q_max = tuple(map(min, q_min, q_max)), tuple(map(max, q_min, q_max))
+        return sorted(i for i in self._candidates(q_min, q_max)
+                      if _boxes_overlap(self.bounds[i][0], self.bounds[i][1], q_min, q_max))
+
+    def query_sphere(self, center, radius):
+        """Sorted indices of exports whose bounds intersect the sphere."""
+        if radius < 0:
+            raise ValueError(f"sphere radius must not be negative (got {radius})")
+        q_min = tuple(c - radius for c in center)
+        q_max = tuple(c + radius for c in center)
+        return sorted(i for i in self._candidates(q_min, q_max)
+                      if _box_sphere_overlap(self.bounds[i][0], self.bounds[i][1], center, radius))
+
+    def query(self, region):
+        """``region`` is {"box": [min xyz, max xyz]} or {"center": xyz, "radius": r}."""
+        if "box" in region:
+            q_min, q_max = region["box"]
+            return self.query_box(tuple(map(float, q_min)), tuple(map(float, q_max)))
+        return self.query_sphere(tuple(map(float, region["center"])), float(region["radius"]))
+
+    def count_types(self, indices):
+        counts = {}
+        for index in indices:
+            counts[self.types[index]] = counts.get(self.types[index], 0) + 1
+        return counts
+
+
+def build_map_index(json_path, cell_size=DEFAULT_CELL_SIZE):
+    """Index every export of a map JSON (non-object entries get an empty box at the origin)."""
+    index = GridIndex(cell_size)
+    for obj in iter_exports(json_path, keys=BOUNDS_KEYS, property_keys=BOUNDS_PROPERTY_KEYS):
+        if isinstance(obj, dict):
+            b_min, b_max = export_bounds(obj)
+            index.insert(b_min, b_max, obj.get("Type", ""))
+        else:
+            index.insert((0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+    return index
+
+
+if __name__ == "__main__":
+    import time
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Count map exports inside a region")
+    parser.add_argument("json_path")
+    parser.add_argument("--box", type=float, nargs=6, metavar=("X1", "Y1", "Z1", "X2", "Y2", "Z2"))
+    parser.add_argument("--center", type=float, nargs=3, metavar=("X", "Y", "Z"))
+    parser.add_argument("--radius", type=float, default=5000.0)
+    parser.add_argument("--cell-size", type=float, default=DEFAULT_CELL_SIZE)
+    args = parser.parse_args()
+
+    start = time.time()
+    index = build_map_index(args.json_path, args.cell_size)
+    built = time.time() - start
+    print(f"✅ Indexed {len(index.bounds)} exports in {len(index.cells)} cells in {built:.2f}s")
+
+    if args.box:
+        region = {"box": [args.box[:3], args.box[3:]]}
+    elif args.center:
+        region = {"center": args.center, "radius": args.radius}
+    else:
+        raise SystemExit(0)
+    start = time.time()
+    hits = index.query(region)
+    print(f"🔍 {len(hits)} exports in region ({(time.time() - start) * 1000:.1f} ms)")
+    for obj_type, count in sorted(index.count_types(hits).items(), key=lambda item: -item[1]):
+        print(f"   {count:6d}  {obj_type or '(no type)'}")
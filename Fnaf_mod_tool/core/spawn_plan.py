@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import hashlib
+from collections import namedtuple
+
+from core.json_stream import iter_exports
+from core.instancing import override_key
+from core.pipeline import file_hash
+
+# Compiles a map JSON into a spawn plan: every decision SBMapReconstuctV5 used
+# to make between editor calls (type dispatch, transforms, mesh and material
+# lookups through the asset index) done once in plain Python. The editor only
+# replays the plan. Plans are cached beside the asset index cache, keyed by the
+# JSON's content hash, the asset index contents and the region, so an unchanged
+# map is never re-parsed. Dry run / profile without the editor:
+#   python -m core.spawn_plan Map.json --content H:/f/Fnaf_mod_tool/fnaf9/Content
+
+PLAN_VERSION = 1
+PLAN_DIR_SUFFIX = ".spawn_plans"
+
+EXPORT_KEYS = ("Type", "Name", "Properties", "RelativeLocation", "RelativeRotation")
+PROPERTY_KEYS = (
+    "RelativeLocation", "RelativeRotation", "RelativeScale3D", "StaticMesh", "OverrideMaterials", "BodySetup",
+    "Intensity", "CastShadows", "LightColor",
+    "SourceRadius", "SoftSourceRadius", "SourceWidth", "SourceHeight",
+)
+LIGHT_TYPES = ("PointLightComponent", "SpotLightComponent", "RectLightComponent")
+LIGHT_PROPERTY_KEYS = ("Intensity", "CastShadows", "LightColor", "SourceRadius", "SoftSourceRadius", "SourceWidth", "SourceHeight")
+
+# location/scale are [x, y, z]; rotation is [roll, pitch, yaw] (unreal.Rotator order)
+LightSpawn = namedtuple("LightSpawn", "index type name location rotation scale props")
+BrushSpawn = namedtuple("BrushSpawn", "index name location rotation scale verts")
+MeshSpawn = namedtuple("MeshSpawn", "index name mesh_path materials location rotation scale")
+ActorSpawn = namedtuple("ActorSpawn", "index type name location rotation scale")
+
+SECTIONS = (("lights", LightSpawn), ("brushes", BrushSpawn), ("meshes", MeshSpawn), ("actors", ActorSpawn))
+
+
+def _xyz(data, keys=("X", "Y", "Z"), default=0.0):
+    return [float(data.get(k, default)) for k in keys]
+
+
+class SpawnPlan:
+    def __init__(self, key=None, lights=(), brushes=(), meshes=(), actors=(), unresolved=None, stats=None):
+        self.key = key
+        self.lights = list(lights)
+        self.brushes = list(brushes)
+        self.meshes = list(meshes)
+        self.actors = list(actors)
+        self.unresolved = unresolved or {}
+        self.stats = stats or {}
+
+    def __len__(self):
+        return len(self.lights) + len(self.brushes) + len(self.meshes) + len(self.actors)
+
+    def subset(self, indices):
+        """Plan with only the entries compiled from the given export indices."""
+        keep = set(indices)
+        return SpawnPlan(
+            self.key,
+            *[[e for e in getattr(self, name) if e.index in keep] for name, _ in SECTIONS],
+            stats=self.stats)
+
+    def to_json(self):
+        data = {"version": PLAN_VERSION, "key": self.key, "unresolved": self.unresolved, "stats": self.stats}
+        for name, _ in SECTIONS:
+            data[name] = [list(entry) for entry in getattr(self, name)]
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        sections = [[entry_type(*entry) for entry in data.get(name, [])] for name, entry_type in SECTIONS]
+        return cls(data.get("key"), *sections, unresolved=data.get("unresolved"), stats=data.get("stats"))
+
+
+# === COMPILING ===
+def _resolve(asset_index, raw_path):
+    base = os.path.basename(raw_path.replace("\\", "/")).split(".")[0]
+    return asset_index.find(base, raw_path), base
+
+
+def compile_export(index, obj, asset_index, plan):
+    props = obj.get("Properties") or {}
+    obj_type = obj.get("Type", "")
+    name = obj.get("Name", "Unnamed")
+    location = obj.get("RelativeLocation") or props.get("RelativeLocation", {"X": 0, "Y": 0, "Z": 0})
+    rotation = obj.get("RelativeRotation") or props.get("RelativeRotation", {"Pitch": 0, "Yaw": 0, "Roll": 0})
+    loc = _xyz(location)
+    rot = _xyz(rotation, ("Roll", "Pitch", "Yaw"))
+    scl = _xyz(props.get("RelativeScale3D", {}), default=1.0)
+
+    if obj_type in LIGHT_TYPES:
+        # lights are placed at the component's own RelativeLocation
+        light_loc = _xyz(props.get("RelativeLocation", {}))
+        light_props = {k: props[k] for k in LIGHT_PROPERTY_KEYS if props.get(k) is not None}
+        plan.lights.append(LightSpawn(index, obj_type, name, light_loc, rot, scl, light_props))
+        return
+
+    if obj_type == "BlockingVolume" and "BodySetup" in props:
+        convex_elems = props["BodySetup"].get("AggGeom", {}).get("ConvexElems", [])
+        for i, convex in enumerate(convex_elems):
+            verts = [_xyz(v) for v in convex.get("VertexData", [])]
+            plan.brushes.append(BrushSpawn(index, f"{name}_Part{i}", loc, rot, scl, verts))
+        return
+
+    if "StaticMesh" in props and isinstance(props["StaticMesh"], dict):
+        mesh_path_raw = props["StaticMesh"].get("ObjectPath", "")
+        if not mesh_path_raw:
+            return
+        mesh_path, mesh_file = _resolve(asset_index, mesh_path_raw)
+        if not mesh_path:
+            plan.unresolved[mesh_file] = plan.unresolved.get(mesh_file, 0) + 1
+            return
+        materials = [_resolve(asset_index, raw)[0] if raw else None for raw in override_key(props)]
+        plan.meshes.append(MeshSpawn(index, name, mesh_path, materials, loc, rot, scl))
+        return
+
+    plan.actors.append(ActorSpawn(index, obj_type, name, loc, rot, scl))
+
+
+def compile_plan(json_path, asset_index, indices=None, key=None):
+    """Compile a map JSON; ``indices`` limits it to those export positions."""
+    start = time.time()
+    keep = set(indices) if indices is not None else None
+    plan = SpawnPlan(key)
+    exports = 0
+    for index, obj in enumerate(iter_exports(json_path, keys=EXPORT_KEYS, property_keys=PROPERTY_KEYS)):
+        exports += 1
+        if not isinstance(obj, dict) or (keep is not None and index not in keep):
+            continue
+        compile_export(index, obj, asset_index, plan)
+    plan.stats = {
+        "exports": exports,
+        "lights": len(plan.lights),
+        "brushes": len(plan.brushes),
+        "meshes": len(plan.meshes),
+        "distinct_meshes": len({m.mesh_path for m in plan.meshes}),
+        "actors": len(plan.actors),
+        "unresolved": sum(plan.unresolved.values()),
+        "compile_seconds": round(time.time() - start, 3),
+    }
+    return plan
+
+
+# === CACHE ===
+def index_signature(asset_index):
+    digest = hashlib.sha1()
+    for name in sorted(asset_index.names):
+        digest.update(name.encode("utf-8"))
+        for path in asset_index.names[name]:
+            digest.update(b"\0" + path.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def plan_key(json_path, asset_index, region=None):
+    parts = [str(PLAN_VERSION), file_hash(json_path), index_signature(asset_index), json.dumps(region, sort_keys=True)]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def plan_cache_path(json_path, asset_index, region=None):
+    name = os.path.splitext(os.path.basename(json_path))[0]
+    if region:
+        # region plans live next to the full one instead of replacing it
+        name += "." + hashlib.sha1(json.dumps(region, sort_keys=True).encode("utf-8")).hexdigest()[:10]
+    return os.path.join(asset_index.content_dir + PLAN_DIR_SUFFIX, name + ".plan.json")
+
+
+def load_or_compile_plan(json_path, asset_index, region=None, use_cache=True):
+    """Return (plan, from_cache). ``region`` is a core.spatial_index region dict."""
+    key = plan_key(json_path, asset_index, region)
+    cache_path = plan_cache_path(json_path, asset_index, region)
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == PLAN_VERSION and data.get("key") == key:
+                return SpawnPlan.from_json(data), True
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable spawn plan {cache_path}: {e}")
+
+    indices = None
+    if region:
+        from core.spatial_index import build_map_index
+        indices = build_map_index(json_path).query(region)
+    plan = compile_plan(json_path, asset_index, indices, key)
+
+    if use_cache:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(plan.to_json(), f, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+    return plan, False
+
+
+def report(plan, from_cache, top=20):
+    stats = plan.stats
+    print(f"{'♻️ Cached' if from_cache else '🛠️ Compiled'} plan: {len(plan)} spawns from {stats.get('exports', 0)} exports "
+          f"in {stats.get('compile_seconds', 0):.2f}s")
+    print(f"   {stats.get('meshes', 0)} mesh placements ({stats.get('distinct_meshes', 0)} distinct meshes), "
+          f"{stats.get('lights', 0)} lights, {stats.get('brushes', 0)} brushes, {stats.get('actors', 0)} other actors")
+    if plan.unresolved:
+        print(f"❌ {stats.get('unresolved', 0)} placements of {len(plan.unresolved)} meshes could not be resolved:")
+        for name, count in sorted(plan.unresolved.items(), key=lambda item: -item[1])[:top]:
+            print(f"   {count:6d}  {name}")
+        if len(plan.unresolved) > top:
+            print(f"   ... and {len(plan.unresolved) - top} more")
+
+
+if __name__ == "__main__":
+    import argparse
+    from core.asset_index import load_asset_index
+
+    parser = argparse.ArgumentParser(description="Compile a map JSON into a spawn plan (dry run, no editor)")
+    parser.add_argument("json_path")
+    parser.add_argument("--content", required=True, help="exported Content folder the asset index covers")
+    parser.add_argument("--content-root", default="/Game/")
+    parser.add_argument("--region", help='JSON region, e.g. \'{"center": [0, 0, 0], "radius": 5000}\'')
+    parser.add_argument("--no-cache", action="store_true", help="always recompile and don't write the plan")
+    args = parser.parse_args()
+
+    start = time.time()
+    asset_index = load_asset_index(args.content, args.content_root)
+    print(f"🗂️ Asset index: {len(asset_index.names)} names in {time.time() - start:.2f}s")
+    start = time.time()
+    plan, from_cache = load_or_compile_plan(
+        args.json_path, asset_index, json.loads(args.region) if args.region else None, not args.no_cache)
+    print(f"⏱️ Plan ready in {time.time() - start:.2f}s")
+    report(plan, from_cache)
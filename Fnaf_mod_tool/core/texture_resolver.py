@@ -0,0 +1,135 @@
+import os
+
+# Texture2D name index shared by the AutoMaterialGenerator scripts.
+# Built once per run from the AssetRegistry; exact names are a dict lookup and
+# substring ("fuzzy") matches go through a trigram index. Every answer,
+# including misses, is remembered for the rest of the run. Scripts get their
+# resolver from get_resolver(), one per root folder, and call reset_resolvers()
+# when a new run starts (the editor keeps this module imported between runs).
+
+GRAM_SIZE = 3
+
+# root folder -> TextureResolver for the current run
+_resolvers = {}
+
+
+def texture_key(raw_name):
+    """Normalize "Texture2D'/Game/T_X.T_X'", "/Game/T_X.T_X" or "T_X.tga" to "t_x"."""
+    name = str(raw_name).strip()
+    if name.endswith("'") and "'" in name[:-1]:
+        name = name[name.index("'") + 1:-1]
+    name = os.path.basename(name.replace("\\", "/"))
+    return name.split(".")[0].lower()
+
+
+def _grams(text):
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class TextureResolver:
+    def __init__(self, entries, unreal=None):
+        """``entries`` is an iterable of (asset name, object path) pairs."""
+        self.unreal = unreal
+        self.entries = []
+        self.exact = {}
+        self.duplicates = {}  # name -> every object path with that name, for names used more than once
+        self.grams = {}
+        self._found = {}
+        self._loaded = {}
+
+        for name, object_path in entries:
+            key = str(name).lower()
+            index = len(self.entries)
+            self.entries.append((str(name), str(object_path)))
+            if key in self.exact:
+                self.duplicates.setdefault(key, [self.exact[key]]).append(str(object_path))
+            else:
+                self.exact[key] = str(object_path)
+            for gram in _grams(key):
+                self.grams.setdefault(gram, set()).add(index)
+
+    @classmethod
+    def from_asset_registry(cls, unreal, root_dir="/Game", scan=True):
+        asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+        if scan:
+            asset_registry.scan_paths_synchronous([root_dir], True)
+        ar_filter = unreal.ARFilter(class_names=["Texture2D"], package_paths=[root_dir], recursive_paths=True)
+        assets = asset_registry.get_assets(ar_filter)
+        resolver = cls(((a.asset_name, a.object_path) for a in assets), unreal)
+        unreal.log(f"🗂️ Indexed {len(resolver.entries)} textures under {root_dir}")
+        return resolver
+
+    def _warn(self, message):
+        if self.unreal is not None:
+            self.unreal.log_warning(message)
+        else:
+            print(message)
+
+    def _exact(self, key, prefer):
+        paths = self.duplicates.get(key)
+        if not paths:
+            return self.exact.get(key)
+        chosen = paths[0]
+        for folder in prefer:
+            matches = [p for p in paths if p.rsplit("/", 1)[0] == folder.rstrip("/")]
+            if matches:
+                chosen = matches[0]
+                break
+        self._warn(f"⚠️ {len(paths)} textures are named '{key}' ({', '.join(paths)}), using {chosen}")
+        return chosen
+
+    def _fuzzy(self, key):
+        if len(key) < GRAM_SIZE:
+            candidates = range(len(self.entries))
+        else:
+            postings = sorted((self.grams.get(g, set()) for g in _grams(key)), key=len)
+            candidates = set.intersection(*postings) if postings[0] else set()
+        best = None
+        for index in candidates:
+            name, object_path = self.entries[index]
+            lowered = name.lower()
+            if key in lowered:
+                # prefer the tightest match, then the earliest registered
+                rank = (len(lowered), index)
+                if best is None or rank < best[0]:
+                    best = (rank, object_path)
+        return best[1] if best else None
+
+    def find(self, raw_name, fuzzy=True, prefer=()):
+        """Return the object path for a texture name, or None.
+
+        When several textures share the name, the first one in a ``prefer``
+        folder wins (else the first registered) and the clash is logged.
+        """
+        key = texture_key(raw_name)
+        prefer = tuple(prefer)
+        cache_key = (key, fuzzy, prefer)
+        if cache_key in self._found:
+            return self._found[cache_key]
+        object_path = self._exact(key, prefer)
+        if object_path is None and fuzzy and key:
+            object_path = self._fuzzy(key)
+        self._found[cache_key] = object_path
+        return object_path
+
+    def load(self, raw_name, fuzzy=True, prefer=()):
+        """Find and load a texture (needs the unreal module), memoized."""
+        object_path = self.find(raw_name, fuzzy, prefer)
+        if object_path is None:
+            return None
+        if object_path not in self._loaded:
+            self._loaded[object_path] = self.unreal.EditorAssetLibrary.load_asset(object_path)
+        return self._loaded[object_path]
+
+
+def get_resolver(unreal, root_dir="/Game"):
+    """The TextureResolver for ``root_dir``, indexed on first use in this run."""
+    root = root_dir.rstrip("/") or "/"
+    if root not in _resolvers:
+        _resolvers[root] = TextureResolver.from_asset_registry(unreal, root)
+    return _resolvers[root]
+
+
+def reset_resolvers():
+    """Forget the indexes from a previous run so new textures are picked up."""
+    _resolvers.clear()
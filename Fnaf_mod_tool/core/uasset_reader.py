@@ -1,22 +1,431 @@
-import os
-
-def read_asset_file(path):
-    try:
-        with open(path, "rb") as f:
-            data = f.read()
-
-        actors = []
-        if b"Begin Actor" in data:
-            name = os.path.splitext(os.path.basename(path))[0]
-            actors.append({
-                "name": name,
-                "transform": {
-                    "location": [0.0, 0.0, 0.0],
-                    "rotation": [0.0, 0.0, 0.0],
-                    "scale": [1.0, 1.0, 1.0]
-                }
-            })
-        return actors
-    except Exception as e:
-        print(f"Failed to parse {path}: {e}")
-        return None
+import os
+import mmap
+import struct
+from collections import namedtuple
+
+# UE4.27 .uasset header reader.
+# Only the package file summary, name map, import table and export table are
+# read, through mmap, so bulk data (and the .uexp next to cooked assets) is
+# never touched. Tables are parsed the first time they are asked for.
+# Check the version-dependent layouts against synthetic packages with:
+#   python -m core.uasset_reader --self-test
+
+PACKAGE_FILE_TAG = 0x9E2A83C1
+PKG_FILTER_EDITOR_ONLY = 0x80000000
+
+# EUnrealEngineObjectUE4Version values the header layout depends on
+VER_UE4_LOAD_FOR_EDITOR_GAME = 365
+VER_UE4_SERIALIZE_TEXT_IN_PACKAGES = 459
+VER_UE4_COOKED_ASSETS_IN_EDITOR_SUPPORT = 485
+VER_UE4_NAME_HASHES_SERIALIZED = 504
+VER_UE4_PRELOAD_DEPENDENCIES_IN_COOKED_EXPORTS = 507
+VER_UE4_TEMPLATE_INDEX_IN_COOKED_EXPORTS = 508
+VER_UE4_64BIT_EXPORTMAP_SERIALSIZES = 511
+VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID = 516
+VER_UE4_NON_OUTER_PACKAGE_IMPORT = 520
+# Cooked game packages are usually saved unversioned; assume 4.27
+VER_UE4_427 = 522
+
+ImportEntry = namedtuple("ImportEntry", "class_package class_name outer_index object_name")
+ExportEntry = namedtuple("ExportEntry", "class_index super_index outer_index object_name serial_size serial_offset is_asset")
+
+
+class UAssetError(Exception):
+    pass
+
+
+# Anything a damaged header can raise while the tables are being read
+READ_ERRORS = (OSError, UAssetError, struct.error, IndexError, UnicodeDecodeError)
+
+
+class UAssetHeader:
+    def __init__(self, path):
+        self.path = path
+        self._names = None
+        self._imports = None
+        self._exports = None
+
+        with open(path, "rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise UAssetError(f"{path} is empty")
+        try:
+            self._read_summary()
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            self.close()
+            raise UAssetError(f"{path}: truncated or corrupt package summary ({e})")
+        except UAssetError:
+            self.close()
+            raise
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # === LOW LEVEL READS ===
+    def _int32(self, offset):
+        return struct.unpack_from("<i", self._data, offset)[0], offset + 4
+
+    def _fstring(self, offset):
+        length, offset = self._int32(offset)
+        if length == 0:
+            return "", offset
+        if length > 0:
+            raw = self._data[offset:offset + length]
+            if len(raw) != length:
+                raise IndexError("string past end of file")
+            return raw[:-1].decode("latin-1"), offset + length
+        size = -length * 2
+        raw = self._data[offset:offset + size]
+        if len(raw) != size:
+            raise IndexError("string past end of file")
+        return raw[:-2].decode("utf-16-le"), offset + size
+
+    def _fname(self, offset):
+        index, number = struct.unpack_from("<ii", self._data, offset)
+        names = self.names
+        if not 0 <= index < len(names):
+            raise UAssetError(f"{self.path}: name index {index} out of range")
+        name = names[index]
+        if number > 0:
+            name = f"{name}_{number - 1}"
+        return name, offset + 8
+
+    # === PACKAGE FILE SUMMARY ===
+    def _read_summary(self):
+        tag, offset = self._int32(0)
+        if tag & 0xFFFFFFFF != PACKAGE_FILE_TAG:
+            raise UAssetError(f"{self.path} is not an Unreal package")
+
+        self.legacy_version, offset = self._int32(offset)
+        if self.legacy_version >= 0 or self.legacy_version < -7:
+            raise UAssetError(f"{self.path}: unsupported legacy file version {self.legacy_version}")
+        if self.legacy_version != -4:
+            offset += 4  # LegacyUE3Version
+        self.file_version, offset = self._int32(offset)
+        self.licensee_version, offset = self._int32(offset)
+        self.unversioned = self.file_version == 0
+        if self.unversioned:
+            self.file_version = VER_UE4_427
+
+        # legacy version -1 packages have no custom version container
+        custom_count = 0
+        if self.legacy_version <= -2:
+            custom_count, offset = self._int32(offset)
+        for _ in range(custom_count):
+            if self.legacy_version == -2:
+                offset += 8
+            elif self.legacy_version >= -5:
+                offset += 20
+                _, offset = self._fstring(offset)
+            else:
+                offset += 20
+
+        self.total_header_size, offset = self._int32(offset)
+        self.folder_name, offset = self._fstring(offset)
+        self.package_flags = struct.unpack_from("<I", self._data, offset)[0]
+        offset += 4
+        self.filter_editor_only = bool(self.package_flags & PKG_FILTER_EDITOR_ONLY)
+
+        self.name_count, self.name_offset = struct.unpack_from("<ii", self._data, offset)
+        offset += 8
+        if self.file_version >= VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID and not self.filter_editor_only:
+            _, offset = self._fstring(offset)
+        if self.file_version >= VER_UE4_SERIALIZE_TEXT_IN_PACKAGES:
+            offset += 8  # GatherableTextData count/offset
+        self.export_count, self.export_offset, self.import_count, self.import_offset = \
+            struct.unpack_from("<iiii", self._data, offset)
+
+        size = len(self._data)
+        for count, table_offset in ((self.name_count, self.name_offset),
+                                    (self.import_count, self.import_offset),
+                                    (self.export_count, self.export_offset)):
+            if count < 0 or count > size or (count and not 0 < table_offset < size):
+                raise UAssetError(f"{self.path}: bad table count/offset in package summary")
+
+    # === TABLES ===
+    @property
+    def names(self):
+        if self._names is None:
+            hashes = self.file_version >= VER_UE4_NAME_HASHES_SERIALIZED
+            names = []
+            offset = self.name_offset
+            for _ in range(self.name_count):
+                name, offset = self._fstring(offset)
+                if hashes:
+                    offset += 4
+                names.append(name)
+            self._names = names
+        return self._names
+
+    @property
+    def imports(self):
+        if self._imports is None:
+            with_package_name = self.file_version >= VER_UE4_NON_OUTER_PACKAGE_IMPORT and not self.filter_editor_only
+            imports = []
+            offset = self.import_offset
+            for _ in range(self.import_count):
+                class_package, offset = self._fname(offset)
+                class_name, offset = self._fname(offset)
+                outer_index, offset = self._int32(offset)
+                object_name, offset = self._fname(offset)
+                if with_package_name:
+                    offset += 8
+                imports.append(ImportEntry(class_package, class_name, outer_index, object_name))
+            self._imports = imports
+        return self._imports
+
+    @property
+    def exports(self):
+        if self._exports is None:
+            version = self.file_version
+            exports = []
+            offset = self.export_offset
+            for _ in range(self.export_count):
+                class_index, super_index = struct.unpack_from("<ii", self._data, offset)
+                offset += 8
+                if version >= VER_UE4_TEMPLATE_INDEX_IN_COOKED_EXPORTS:
+                    offset += 4
+                outer_index, offset = self._int32(offset)
+                object_name, offset = self._fname(offset)
+                offset += 4  # ObjectFlags
+                if version >= VER_UE4_64BIT_EXPORTMAP_SERIALSIZES:
+                    serial_size, serial_offset = struct.unpack_from("<qq", self._data, offset)
+                    offset += 16
+                else:
+                    serial_size, serial_offset = struct.unpack_from("<ii", self._data, offset)
+                    offset += 8
+                offset += 12 + 16 + 4  # forced/client/server flags, PackageGuid, PackageFlags
+                if version >= VER_UE4_LOAD_FOR_EDITOR_GAME:
+                    offset += 4
+                is_asset = False
+                if version >= VER_UE4_COOKED_ASSETS_IN_EDITOR_SUPPORT:
+                    is_asset = struct.unpack_from("<i", self._data, offset)[0] != 0
+                    offset += 4
+                if version >= VER_UE4_PRELOAD_DEPENDENCIES_IN_COOKED_EXPORTS:
+                    offset += 20
+                exports.append(ExportEntry(class_index, super_index, outer_index, object_name,
+                                           serial_size, serial_offset, is_asset))
+            self._exports = exports
+        return self._exports
+
+    # === HIGH LEVEL ===
+    def resolve_name(self, package_index):
+        if package_index < 0:
+            return self.imports[-package_index - 1].object_name
+        if package_index > 0:
+            return self.exports[package_index - 1].object_name
+        return "Class"
+
+    @property
+    def main_export(self):
+        exports = self.exports
+        if not exports:
+            return None
+        for export in exports:
+            if export.is_asset:
+                return export
+        package_name = os.path.splitext(os.path.basename(self.path))[0].lower()
+        for export in exports:
+            if export.outer_index == 0 and export.object_name.lower() == package_name:
+                return export
+        return exports[0]
+
+    @property
+    def main_export_class(self):
+        export = self.main_export
+        return self.resolve_name(export.class_index) if export else None
+
+    @property
+    def main_export_name(self):
+        export = self.main_export
+        return export.object_name if export else None
+
+    @property
+    def imported_packages(self):
+        return [imp.object_name for imp in self.imports
+                if imp.class_name == "Package" and imp.outer_index == 0]
+
+
+def read_asset_file(path):
+    """Return a summary dict of the package header, or None if unreadable."""
+    try:
+        with UAssetHeader(path) as header:
+            return {
+                "name": os.path.splitext(os.path.basename(path))[0],
+                "class": header.main_export_class,
+                "object_name": header.main_export_name,
+                "imports": header.imported_packages,
+            }
+    except READ_ERRORS as e:
+        print(f"Failed to parse {path}: {e}")
+        return None
+
+
+def read_asset_class(path):
+    """Return just the main export's class name, or None if unreadable."""
+    try:
+        with UAssetHeader(path) as header:
+            return header.main_export_class
+    except READ_ERRORS:
+        return None
+
+
+def scan_asset_classes(folder):
+    """Yield (path, class name) for every .uasset under ``folder``."""
+    for root, _, files in os.walk(folder):
+        for file in files:
+            if file.lower().endswith(".uasset"):
+                path = os.path.join(root, file)
+                yield path, read_asset_class(path)
+
+
+# === SELF-TEST (synthetic packages) ===
+def _pack_fstring(text):
+    if not text:
+        return struct.pack("<i", 0)
+    raw = text.encode("latin-1") + b"\0"
+    return struct.pack("<i", len(raw)) + raw
+
+
+def build_test_package(file_version=VER_UE4_427, legacy_version=-7, filter_editor_only=False,
+                       asset_class="StaticMesh", asset_name="SM_Test", mark_asset=True):
+    """Bytes of a minimal package: one export of ``asset_class`` imported from /Script/Engine.
+
+    The summary, name map, import and export tables are laid out the way a
+    package of ``file_version`` (0 = unversioned) and ``legacy_version`` is.
+    """
+    version = file_version or VER_UE4_427
+    names = ["/Script/CoreUObject", "Package", "/Script/Engine", "Class", asset_class, asset_name, "None"]
+
+    def fname(name, number=0):
+        return struct.pack("<ii", names.index(name), number)
+
+    def summary(name_offset, export_offset, import_offset):
+        out = struct.pack("<Ii", PACKAGE_FILE_TAG, legacy_version)
+        if legacy_version != -4:
+            out += struct.pack("<i", 864)  # LegacyUE3Version
+        out += struct.pack("<ii", file_version, 0)
+        if legacy_version <= -2:
+            out += struct.pack("<i", 1)
+            if legacy_version == -2:
+                out += struct.pack("<ii", 7, 1)
+            elif legacy_version >= -5:
+                out += b"\x11" * 16 + struct.pack("<i", 3) + _pack_fstring("TestVersion")
+            else:
+                out += b"\x11" * 16 + struct.pack("<i", 3)
+        out += struct.pack("<i", 0)  # TotalHeaderSize
+        out += _pack_fstring("None")
+        out += struct.pack("<I", PKG_FILTER_EDITOR_ONLY if filter_editor_only else 0)
+        out += struct.pack("<ii", len(names), name_offset)
+        if version >= VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID and not filter_editor_only:
+            out += _pack_fstring("0123456789ABCDEF")
+        if version >= VER_UE4_SERIALIZE_TEXT_IN_PACKAGES:
+            out += struct.pack("<ii", 0, 0)
+        out += struct.pack("<iiii", 1, export_offset, 2, import_offset)
+        return out + b"\0" * 64  # the summary fields the reader never looks at
+
+    name_map = b""
+    for name in names:
+        name_map += _pack_fstring(name)
+        if version >= VER_UE4_NAME_HASHES_SERIALIZED:
+            name_map += struct.pack("<HH", 0xBEEF, 0xCAFE)
+
+    import_table = b""
+    for class_package, class_name, outer_index, object_name in (
+            ("/Script/CoreUObject", "Package", 0, "/Script/Engine"),
+            ("/Script/CoreUObject", "Class", -1, asset_class)):
+        import_table += fname(class_package) + fname(class_name) + struct.pack("<i", outer_index) + fname(object_name)
+        if version >= VER_UE4_NON_OUTER_PACKAGE_IMPORT and not filter_editor_only:
+            import_table += fname("None")
+
+    export_table = struct.pack("<ii", -2, 0)
+    if version >= VER_UE4_TEMPLATE_INDEX_IN_COOKED_EXPORTS:
+        export_table += struct.pack("<i", 0)
+    export_table += struct.pack("<i", 0) + fname(asset_name) + struct.pack("<I", 1)
+    if version >= VER_UE4_64BIT_EXPORTMAP_SERIALSIZES:
+        export_table += struct.pack("<qq", 1234, 5678)
+    else:
+        export_table += struct.pack("<ii", 1234, 5678)
+    export_table += struct.pack("<iii", 0, 0, 0) + b"\0" * 16 + struct.pack("<I", 0)
+    if version >= VER_UE4_LOAD_FOR_EDITOR_GAME:
+        export_table += struct.pack("<i", 0)
+    if version >= VER_UE4_COOKED_ASSETS_IN_EDITOR_SUPPORT:
+        export_table += struct.pack("<i", 1 if mark_asset else 0)
+    if version >= VER_UE4_PRELOAD_DEPENDENCIES_IN_COOKED_EXPORTS:
+        export_table += struct.pack("<5i", -1, 0, 0, 0, 0)
+
+    name_offset = len(summary(0, 0, 0))
+    import_offset = name_offset + len(name_map)
+    export_offset = import_offset + len(import_table)
+    return summary(name_offset, export_offset, import_offset) + name_map + import_table + export_table
+
+
+def self_test():
+    """Parse synthetic packages for each layout the reader handles; raises AssertionError on a mismatch."""
+    import tempfile
+
+    cases = [
+        ("4.27", dict()),
+        ("4.27 unversioned", dict(file_version=0)),
+        ("4.27 editor-only filtered", dict(filter_editor_only=True)),
+        ("before PackageName in imports", dict(file_version=VER_UE4_NON_OUTER_PACKAGE_IMPORT - 1)),
+        ("before localization ID", dict(file_version=VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID - 1)),
+        ("32-bit export sizes", dict(file_version=VER_UE4_64BIT_EXPORTMAP_SERIALSIZES - 1)),
+        ("before name hashes", dict(file_version=VER_UE4_NAME_HASHES_SERIALIZED - 1)),
+        ("no bIsAsset flag", dict(file_version=VER_UE4_COOKED_ASSETS_IN_EDITOR_SUPPORT - 1)),
+        ("legacy version -1 (no custom versions)", dict(legacy_version=-1)),
+        ("legacy version -2 (enum custom versions)", dict(legacy_version=-2)),
+        ("legacy version -4 (no UE3 version)", dict(legacy_version=-4)),
+        ("legacy version -5 (guid custom versions)", dict(legacy_version=-5)),
+        ("export not marked as asset", dict(mark_asset=False, asset_class="Texture2D", asset_name="T_Test")),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, options in cases:
+            asset_class = options.get("asset_class", "StaticMesh")
+            asset_name = options.get("asset_name", "SM_Test")
+            path = os.path.join(tmp, asset_name + ".uasset")
+            with open(path, "wb") as f:
+                f.write(build_test_package(**options))
+            with UAssetHeader(path) as header:
+                assert header.main_export_class == asset_class, (label, header.main_export_class)
+                assert header.main_export_name == asset_name, (label, header.main_export_name)
+                assert header.imported_packages == ["/Script/Engine"], (label, header.imported_packages)
+                assert header.main_export.serial_size == 1234, (label, header.main_export)
+                assert header.main_export.serial_offset == 5678, (label, header.main_export)
+            assert read_asset_class(path) == asset_class, label
+            print(f"✅ {label}")
+
+        path = os.path.join(tmp, "Broken.uasset")
+        with open(path, "wb") as f:
+            f.write(build_test_package()[:40])
+        assert read_asset_class(path) is None, "truncated package"
+        print("✅ truncated package is reported as unreadable")
+    print(f"🏁 {len(cases) + 1} synthetic packages read correctly")
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from collections import Counter
+
+    if "--self-test" in sys.argv:
+        self_test()
+        raise SystemExit(0)
+    if len(sys.argv) < 2:
+        print("Usage: python uasset_reader.py <folder> | --self-test")
+        raise SystemExit(1)
+    start = time.time()
+    counts = Counter(cls or "<unreadable>" for _, cls in scan_asset_classes(sys.argv[1]))
+    total = sum(counts.values())
+    print(f"✅ Read {total} package headers in {time.time() - start:.1f}s")
+    for cls, count in counts.most_common():
+        print(f"  {count:8d}  {cls}")
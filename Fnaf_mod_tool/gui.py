@@ -1,10 +1,18 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
-import subprocess
 import os
+import sys
 import json
+import time
+import queue
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.script_runner import ScriptRunner
+from core.editor_session import write_bootstrap, parse_result
 
 CONFIG_FILE = "config.json"
+POLL_MS = 100
 
 SCRIPTS = {
     "Generate Materials WIP": "Scripts/AutoMaterialGenerator_V5.py",
@@ -35,9 +43,15 @@ class UE4PythonGUI:
 
         self.project_path = tk.StringVar()
         self.uecmd_path = tk.StringVar()
+        self.single_session = tk.BooleanVar(value=True)
+        self.session_results = []
 
         self.load_config()
 
+        self.events = queue.Queue()
+        self.runner = ScriptRunner(self.events)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # UE4 Cmd path
         tk.Label(root, text="Select UE4Editor-Cmd.exe:").pack()
         tk.Entry(root, textvariable=self.uecmd_path, width=60).pack(pady=5)
@@ -61,8 +75,16 @@ class UE4PythonGUI:
             tk.Checkbutton(frame, text=name, variable=var).pack(side="left")
             tk.Button(frame, text="Instructions", command=lambda n=name: self.show_instructions(n)).pack(side="left", padx=5)
 
-        # Run button
-        tk.Button(root, text="Run Selected Scripts", command=self.run_scripts).pack(pady=10)
+        tk.Checkbutton(root, text="Run all selected scripts in one editor session",
+                       variable=self.single_session, command=self.save_config).pack(anchor="w", padx=10, pady=(8, 0))
+
+        # Run / cancel buttons
+        buttons = tk.Frame(root)
+        buttons.pack(pady=10)
+        self.run_button = tk.Button(buttons, text="Run Selected Scripts", command=self.run_scripts)
+        self.run_button.pack(side="left", padx=5)
+        self.cancel_button = tk.Button(buttons, text="Cancel", command=self.cancel_scripts, state="disabled")
+        self.cancel_button.pack(side="left", padx=5)
 
        #Console output
         tk.Label(root, text="Output:").pack()
@@ -99,31 +121,109 @@ class UE4PythonGUI:
             messagebox.showinfo("Nothing Selected", "No scripts selected.")
             return
 
-        for script in selected_scripts:
-            script_full_path = os.path.abspath(script)
+        jobs = []
+        self.session_results = []
+        if self.single_session.get() and len(selected_scripts) > 1:
+            # One editor boot for the whole selection; the bootstrap reports per script
+            bootstrap = write_bootstrap(selected_scripts)
             cmd = [
                 uecmd,
                 project,
-                f"-ExecutePythonScript={script_full_path}"
+                f"-ExecutePythonScript={bootstrap}"
             ]
+            jobs.append(("editor session (" + ", ".join(os.path.basename(s) for s in selected_scripts) + ")", cmd))
+        else:
+            for script in selected_scripts:
+                script_full_path = os.path.abspath(script)
+                cmd = [
+                    uecmd,
+                    project,
+                    f"-ExecutePythonScript={script_full_path}"
+                ]
+                jobs.append((os.path.basename(script), cmd))
+
+        # The editor runs on a background thread; poll_events drains its output
+        self.run_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.runner.start(jobs)
+        self.root.after(POLL_MS, self.poll_events)
+
+    def cancel_scripts(self):
+        self.cancel_button.config(state="disabled")
+        self.write("Cancelling...\n")
+        self.runner.cancel()
+
+    def write(self, text, timestamp=None):
+        stamp = time.strftime("%H:%M:%S", time.localtime(timestamp or time.time()))
+        self.console.insert(tk.END, f"[{stamp}] {text}")
+        self.console.see(tk.END)
+
+    def poll_events(self):
+        try:
+            while True:
+                event = self.events.get_nowait()
+                if self.handle_event(event):
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self.poll_events)
+
+    def handle_event(self, event):
+        """Show one runner event; returns True once the whole run has finished."""
+        kind, timestamp = event[0], event[1]
+        if kind == "start":
+            name, cmd = event[2], event[3]
             cmd_str = " ".join(f'"{c}"' if ' ' in c else c for c in cmd)
-            self.console.insert(tk.END, f"Running command:\n{cmd_str}\n\n")
-            self.console.insert(tk.END, f"Resolved script path: {script_full_path}\n\n")
-            self.console.see(tk.END)
-
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                self.console.insert(tk.END, result.stdout)
-                self.console.insert(tk.END, result.stderr)
-                if result.returncode != 0:
-                    self.console.insert(tk.END, f"\n[ERROR] Script failed with code {result.returncode}\n")
+            self.write(f"Running {name}:\n{cmd_str}\n\n", timestamp)
+        elif kind == "line":
+            name, stream, text = event[2], event[3], event[4]
+            result = parse_result(text)
+            if result is not None:
+                self.session_results.append(result)
+                script = os.path.basename(result.get("script", "?"))
+                if result.get("ok"):
+                    self.write(f"[SUCCESS] {script} finished in {result.get('seconds', 0):.1f}s\n", timestamp)
                 else:
-                    self.console.insert(tk.END, f"\n[SUCCESS] Script finished.\n")
-            except Exception as e:
-                self.console.insert(tk.END, f"\n[EXCEPTION] {e}\n")
-
+                    self.write(f"[ERROR] {script} failed: {result.get('error')}\n", timestamp)
+                return False
+            prefix = "[stderr] " if stream == "stderr" else ""
+            self.write(f"{prefix}{text}\n", timestamp)
+        elif kind == "exit":
+            name, returncode, seconds = event[2], event[3], event[4]
+            if returncode is None:
+                self.write(f"[CANCELLED] {name} after {seconds:.1f}s\n", timestamp)
+            elif returncode != 0:
+                self.write(f"[ERROR] {name} failed with code {returncode} after {seconds:.1f}s\n", timestamp)
+            else:
+                self.write(f"[SUCCESS] {name} finished in {seconds:.1f}s\n", timestamp)
+            self.console.insert(tk.END, "-"*80 + "\n")
+        elif kind == "error":
+            self.write(f"[EXCEPTION] {event[2]}: {event[3]}\n", timestamp)
             self.console.insert(tk.END, "-"*80 + "\n")
+        elif kind == "done":
+            results = event[2]
+            self.write("Summary:\n", timestamp)
+            for name, returncode in results:
+                status = "cancelled/not started" if returncode is None else f"exit code {returncode}"
+                self.console.insert(tk.END, f"    {name}: {status}\n")
+            for result in self.session_results:
+                status = "ok" if result.get("ok") else f"failed ({result.get('error')})"
+                self.console.insert(tk.END, f"        {os.path.basename(result.get('script', '?'))}: {status}\n")
             self.console.see(tk.END)
+            self.run_button.config(state="normal")
+            self.cancel_button.config(state="disabled")
+            return True
+        return False
+
+    def on_close(self):
+        # Don't leave an editor process running behind a closed launcher
+        running = self.runner.running
+        if running:
+            self.runner.cancel()
+        self.root.destroy()
+        if running:
+            # the runner thread is a daemon: let it stop the process before the interpreter exits
+            self.runner.wait()
 
     def show_instructions(self, script_name):
         instructions = SCRIPT_INSTRUCTIONS.get(script_name, "No instructions available.")
@@ -132,7 +232,8 @@ class UE4PythonGUI:
     def save_config(self):
         data = {
             "project_path": self.project_path.get(),
-            "uecmd_path": self.uecmd_path.get()
+            "uecmd_path": self.uecmd_path.get(),
+            "single_session": self.single_session.get()
         }
         with open(CONFIG_FILE, "w") as f:
             json.dump(data, f)
@@ -144,6 +245,7 @@ class UE4PythonGUI:
                     data = json.load(f)
                     self.project_path.set(data.get("project_path", ""))
                     self.uecmd_path.set(data.get("uecmd_path", ""))
+                    self.single_session.set(data.get("single_session", True))
             except Exception as e:
                 print("Failed to load config:", e)
 
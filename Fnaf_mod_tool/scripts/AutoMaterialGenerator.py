@@ -1,32 +1,44 @@
 import unreal
+import os
 import re
+import sys
+
+# === Make Fnaf_mod_tool/core importable ===
+try:
+    TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+except NameError:
+    TOOL_DIR = "H:/f/Fnaf_mod_tool"
+if TOOL_DIR not in sys.path:
+    sys.path.append(TOOL_DIR)
+
+from core.texture_resolver import TextureResolver
 
 TEXTURE_FOLDER = "/Game/Textures"
 MATERIAL_FOLDER = "/Game/Materials"
 
-asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
-asset_registry.scan_paths_synchronous([TEXTURE_FOLDER], True)
-
 def normalize_name(name):
     return re.sub(r'(basecolor|albedo|diffuse|normal|_n|nrm|norm|_orm|rough|roughness|_r|metal|metallic|_m)', '', name.lower())
 
-def find_matching_texture(base_texture_name, all_assets, keywords):
-    normalized_base = normalize_name(base_texture_name)
-    for asset in all_assets:
-        if asset.asset_class == "Texture2D":
-            name = str(asset.asset_name)
-            if any(k in name.lower() for k in keywords):
-                if normalize_name(name) == normalized_base:
-                    return asset.get_asset()
+def build_normalized_index(resolver):
+    # normalized name -> texture names, so each lookup only checks its own group
+    index = {}
+    for name, _ in resolver.entries:
+        index.setdefault(normalize_name(name), []).append(name)
+    return index
+
+def find_matching_texture(base_texture_name, resolver, normalized_index, keywords):
+    for name in normalized_index.get(normalize_name(base_texture_name), []):
+        if any(k in name.lower() for k in keywords):
+            return resolver.load(name, fuzzy=False)
     return None
 
-def create_material(texture_data, all_assets):
-    texture = texture_data.get_asset()
+def create_material(texture_name, resolver, normalized_index):
+    texture = resolver.load(texture_name, fuzzy=False)
     texture_name = texture.get_name()
 
-    normal_texture = find_matching_texture(texture_name, all_assets, ["normal", "_n", "nrm", "norm", "_orm"])
-    roughness_texture = find_matching_texture(texture_name, all_assets, ["rough", "roughness", "_r"])
-    metallic_texture = find_matching_texture(texture_name, all_assets, ["metal", "metallic", "_m"])
+    normal_texture = find_matching_texture(texture_name, resolver, normalized_index, ["normal", "_n", "nrm", "norm", "_orm"])
+    roughness_texture = find_matching_texture(texture_name, resolver, normalized_index, ["rough", "roughness", "_r"])
+    metallic_texture = find_matching_texture(texture_name, resolver, normalized_index, ["metal", "metallic", "_m"])
 
     if not (normal_texture or roughness_texture or metallic_texture):
         print(f"⏭️ Skipping {texture_name}: No matching maps.")
@@ -73,17 +85,17 @@ def create_material(texture_data, all_assets):
     print(f"✅ Created material: {material.get_name()} from {texture_name}")
 
 def main():
-    all_assets = asset_registry.get_assets_by_path(TEXTURE_FOLDER, recursive=True)
+    resolver = TextureResolver.from_asset_registry(unreal, TEXTURE_FOLDER)
+    normalized_index = build_normalized_index(resolver)
     base_textures = []
 
-    for a in all_assets:
-        if a.asset_class == "Texture2D":
-            name = str(a.asset_name).lower()
-            if not any(x in name for x in ["normal", "_n", "nrm", "norm", "_orm", "rough", "roughness", "_r", "metal", "metallic", "_m"]):
-                base_textures.append(a)
+    for texture_name, _ in resolver.entries:
+        name = texture_name.lower()
+        if not any(x in name for x in ["normal", "_n", "nrm", "norm", "_orm", "rough", "roughness", "_r", "metal", "metallic", "_m"]):
+            base_textures.append(texture_name)
 
     print(f"🔍 Found {len(base_textures)} base textures.")
-    for texture_data in base_textures:
-        create_material(texture_data, all_assets)
+    for texture_name in base_textures:
+        create_material(texture_name, resolver, normalized_index)
 
 main()
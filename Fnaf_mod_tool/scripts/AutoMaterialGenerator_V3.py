@@ -1,7 +1,21 @@
 import unreal
 import os
+import sys
 import json
 
+# === Make Fnaf_mod_tool/core importable ===
+try:
+    TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+except NameError:
+    TOOL_DIR = "H:/f/Fnaf_mod_tool"
+if TOOL_DIR not in sys.path:
+    sys.path.append(TOOL_DIR)
+
+from core.texture_resolver import get_resolver, reset_resolvers
+
+# new run: index the textures again instead of reusing the last run's
+reset_resolvers()
+
 # SETTINGS
 JSON_FOLDER = "H:/f/Fnaf_mod_tool/json/Maps/mats"  # Full path to material JSON files
 SAVE_MATERIALS_TO = "/Game/Matireals"  # Where to save generated materials
@@ -13,22 +27,8 @@ def ensure_directory_exists(path):
         unreal.EditorAssetLibrary.make_directory(path)
 
 def find_texture_by_filename(root_dir, filename):
-    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
-    asset_registry.scan_paths_synchronous([root_dir], True)
-    assets = asset_registry.get_assets_by_path(root_dir, recursive=True)
-
-    base_name = os.path.basename(filename).split(".")[0].lower()
-
-    for asset in assets:
-        if asset.asset_class == "Texture2D" and str(asset.asset_name).lower() == base_name:
-            return asset.object_path
-
-    # Fallback fuzzy match: try partial matching
-    for asset in assets:
-        if asset.asset_class == "Texture2D" and base_name in str(asset.asset_name).lower():
-            return asset.object_path
-
-    return None
+    # Exact name first, then the closest name containing it
+    return get_resolver(unreal, root_dir).find(filename, fuzzy=True)
 
 def material_exists_in_folder(material_name, folder_path):
     asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
@@ -1,6 +1,23 @@
 import unreal
 import json
 import os
+import sys
+
+# === Make Fnaf_mod_tool/core importable ===
+try:
+    TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+except NameError:
+    TOOL_DIR = "H:/f/Fnaf_mod_tool"
+if TOOL_DIR not in sys.path:
+    sys.path.append(TOOL_DIR)
+
+from core.texture_resolver import get_resolver, reset_resolvers
+
+# new run: index the textures again instead of reusing the last run's
+reset_resolvers()
+
+# Textures are looked up by name across /Game; on a name clash this folder wins
+SHADING_TEXTURE_FOLDER = '/Game/ShadingAssets/Textures'
 
 # Texture suffix mapping to material properties and sampler types
 TEXTURE_USAGE_MAP = {
@@ -28,10 +45,9 @@ def create_material_with_textures(material_name, texture_names, material_path='/
     # Create nodes from textures
     for tex_name in texture_names:
         try:
-            texture_asset_path = f"/Game/ShadingAssets/Textures/{tex_name}"
-            texture = unreal.load_asset(texture_asset_path)
+            texture = get_resolver(unreal, "/Game").load(tex_name, fuzzy=False, prefer=(SHADING_TEXTURE_FOLDER,))
             if not texture:
-                print(f"❌ Texture not found: {texture_asset_path}")
+                print(f"❌ Texture not found: {tex_name}")
                 continue
 
             texture_sample = unreal.MaterialEditingLibrary.create_material_expression(material, unreal.MaterialExpressionTextureSample)
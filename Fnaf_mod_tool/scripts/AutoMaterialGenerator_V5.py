@@ -1,10 +1,53 @@
 import unreal
 import os
+import sys
 import json
 import tkinter as tk
 from tkinter import filedialog
 from tkinter import ttk
 
+# === Make Fnaf_mod_tool/core importable ===
+try:
+    TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+except NameError:
+    TOOL_DIR = "H:/f/Fnaf_mod_tool"
+if TOOL_DIR not in sys.path:
+    sys.path.append(TOOL_DIR)
+
+from core.texture_resolver import get_resolver, reset_resolvers
+from core.master_materials import (
+    MasterMaterialLibrary, classify_param, master_key, sampler_type_name, create_material_instance,
+)
+from core.material_dedup import MaterialDedup, material_signature, ALIAS_FILE_NAME
+from core.pipeline import pipeline_files
+
+# new run: index the textures again instead of reusing the last run's
+reset_resolvers()
+
+# === CONFIGURATION ===
+# Emit MaterialInstanceConstants of a few shared master materials instead of
+# building and compiling a new Material for every JSON. Masters know the roles
+# in core/master_materials.py ROLES; other texture parameters are logged and
+# left out of the instance.
+USE_MATERIAL_INSTANCES = True
+MASTER_MATERIAL_FOLDER = '/Game/GeneratedMaterials/Masters'
+# Wire every material first and compile/save them all in one pass at the end,
+# so the shader compiler workers get the whole batch at once.
+BULK_COMPILE = True
+# When several textures share a name, the one in the textures root or this
+# folder (where the old fixed-path lookup looked) is used.
+SHADING_TEXTURE_FOLDER = '/Game/ShadingAssets/Textures'
+
+_master_library = None
+# Materials/instances created this run waiting for the bulk compile + save pass
+_pending_assets = []
+
+def get_master_library():
+    global _master_library
+    if _master_library is None:
+        _master_library = MasterMaterialLibrary(unreal, MASTER_MATERIAL_FOLDER)
+    return _master_library
+
 def clean_texture_name(raw_name):
     if raw_name.startswith("Texture2D'") and raw_name.endswith("'"):
         raw_name = raw_name[len("Texture2D'"):-1]
@@ -49,16 +92,12 @@ def create_material_from_textures(material_name, texture_params, textures_root_p
     x_pos = -384
     y_pos = 0
 
+    texture_resolver = get_resolver(unreal, textures_root_path)
     for param_name, tex_name in texture_params.items():
-        tex_asset_path = f"{textures_root_path}/{tex_name}"
-        texture_asset = unreal.EditorAssetLibrary.load_asset(tex_asset_path)
+        texture_asset = texture_resolver.load(tex_name, fuzzy=False, prefer=(textures_root_path, SHADING_TEXTURE_FOLDER))
 
         if not texture_asset:
-            alt_path = tex_asset_path.replace('/Game/', '/Game/ShadingAssets/Textures/')
-            texture_asset = unreal.EditorAssetLibrary.load_asset(alt_path)
-
-        if not texture_asset:
-            unreal.log_warning(f"Texture asset not found: {tex_asset_path}")
+            unreal.log_warning(f"Texture asset not found: {tex_name}")
             continue
 
         tex_sample_node = material_lib.create_material_expression(new_material, unreal.MaterialExpressionTextureSample, x_pos, y_pos)
@@ -87,14 +126,126 @@ def create_material_from_textures(material_name, texture_params, textures_root_p
     connect_property('emissive', 'RGB', 'MP_EMISSIVE_COLOR')
     connect_property('displacement', 'R', 'MP_WORLD_POSITION_OFFSET')
 
+    if BULK_COMPILE:
+        _pending_assets.append(new_material)
+        unreal.log(f"🧩 Wired material '{material_name}' with textures: {list(sample_nodes.keys())} (compile deferred)")
+        return new_material
+
     material_lib.recompile_material(new_material)
     unreal.EditorAssetLibrary.save_loaded_asset(new_material)
 
     unreal.log(f"✅ Created material '{material_name}' with textures: {list(sample_nodes.keys())}")
     return new_material
 
-def process_json_folder_with_progress(folder_path):
-    json_files = [f for f in os.listdir(folder_path) if f.endswith('.json')]
+def create_material_instance_from_textures(material_name, texture_params, textures_root_path='/Game'):
+    package_path = '/Game/GeneratedMaterials'
+
+    existing_material = unreal.EditorAssetLibrary.find_asset_data(f"{package_path}/{material_name}").get_asset()
+    if existing_material:
+        unreal.log_warning(f"Material '{material_name}' already exists. Skipping.")
+        return existing_material
+
+    texture_resolver = get_resolver(unreal, textures_root_path)
+    role_textures = {}
+    role_samplers = {}
+    for param_name, tex_name in texture_params.items():
+        role = classify_param(param_name)
+        if not role:
+            unreal.log_warning(f"Unknown texture parameter '{param_name}' in {material_name}, ignored.")
+            continue
+        if role in role_textures:
+            continue
+
+        texture_asset = texture_resolver.load(tex_name, fuzzy=False, prefer=(textures_root_path, SHADING_TEXTURE_FOLDER))
+        if not texture_asset:
+            unreal.log_warning(f"Texture asset not found: {tex_name}")
+            continue
+        role_textures[role] = texture_asset
+        role_samplers[role] = sampler_type_name(unreal, texture_asset)
+
+    if not role_textures:
+        unreal.log_warning(f"⚠️ No usable textures for {material_name}, no instance created.")
+        return None
+
+    master = get_master_library().get(master_key(role_samplers), role_textures)
+    if not master:
+        return None
+
+    instance = create_material_instance(unreal, material_name, package_path, master, role_textures, save=not BULK_COMPILE)
+    if instance and BULK_COMPILE:
+        _pending_assets.append(instance)
+    if instance:
+        unreal.log(f"✅ Created material instance '{material_name}' of '{master.get_name()}' with: {list(role_textures.keys())}")
+    return instance
+
+def compile_pending_assets():
+    # One recompile pass over every deferred Material (the compiles are queued
+    # to the shader workers together), then save everything. recompile_material
+    # only queues the shader compile: shader errors are not visible to Python in
+    # 4.27 and show up in the Output Log as the compiles finish. What is
+    # reported here are failures to queue a compile or to save an asset.
+    pending = list(_pending_assets)
+    del _pending_assets[:]
+    if not pending:
+        return []
+
+    failures = []
+    materials = [asset for asset in pending if isinstance(asset, unreal.Material)]
+    with unreal.ScopedSlowTask(len(materials) + len(pending), f"Compiling {len(materials)} materials...") as task:
+        task.make_dialog(False)
+        for material in materials:
+            task.enter_progress_frame(1, f"Queueing compile: {material.get_name()}")
+            try:
+                unreal.MaterialEditingLibrary.recompile_material(material)
+            except Exception as e:
+                failures.append((material.get_name(), f"could not queue compile: {e}"))
+
+        failed_names = {name for name, _ in failures}
+        for asset in pending:
+            task.enter_progress_frame(1, f"Saving: {asset.get_name()}")
+            if asset.get_name() in failed_names:
+                continue
+            if not unreal.EditorAssetLibrary.save_loaded_asset(asset):
+                failures.append((asset.get_name(), "save failed"))
+
+    unreal.log(f"✅ Saved {len(pending) - len(failures)}/{len(pending)} assets, shader compiles queued for "
+               f"{len(materials)} materials (check the Output Log for shader errors)")
+    for name, reason in failures:
+        unreal.log_error(f"❌ {name}: {reason}")
+    return failures
+
+def texture_signature(texture_params, textures_root_path='/Game'):
+    # What the material would actually be built from: resolved texture,
+    # the slot it is wired to and its sampler type
+    texture_resolver = get_resolver(unreal, textures_root_path)
+    slots = []
+    used_roles = set()
+    for param_name, tex_name in texture_params.items():
+        texture_path = texture_resolver.find(tex_name, fuzzy=False, prefer=(textures_root_path, SHADING_TEXTURE_FOLDER))
+        if not texture_path:
+            continue
+        if USE_MATERIAL_INSTANCES:
+            role = classify_param(param_name)
+            texture_asset = texture_resolver.load(tex_name, fuzzy=False, prefer=(textures_root_path, SHADING_TEXTURE_FOLDER))
+            if not role or role in used_roles or not texture_asset:
+                continue
+            used_roles.add(role)
+            sampler = sampler_type_name(unreal, texture_asset)
+        else:
+            role = param_name
+            sampler = "NORMAL" if 'normal' in param_name else "COLOR"
+        slots.append((role, texture_path, sampler))
+    return material_signature(slots)
+
+def process_json_folder_with_progress(folder_path, only=None):
+    json_files = [f for f in os.listdir(folder_path) if f.endswith('.json') and f != ALIAS_FILE_NAME]
+    if only is not None:
+        json_files = [f for f in json_files if f in only]
+
+    # Materials with identical texture signatures are built once; the other
+    # names are recorded as aliases for AutoMatiral3dModelConverterV2
+    dedup = MaterialDedup(os.path.join(folder_path, ALIAS_FILE_NAME))
+    aliased = 0
 
     # Tkinter setup for progress bar
     root = tk.Tk()
@@ -109,7 +260,24 @@ def process_json_folder_with_progress(folder_path):
 
     root.update()
 
-    for idx, json_file in enumerate(json_files, start=1):
+    def requeue(aliases):
+        # aliases whose material changed under them: build or re-point them this run
+        for alias in aliases:
+            alias_file = dedup.sources.get(alias, alias + '.json')
+            if alias_file in json_files[idx:]:
+                continue  # still waiting its turn
+            if not os.path.exists(os.path.join(folder_path, alias_file)):
+                unreal.log_warning(f"⚠️ '{alias}' no longer matches its material and {alias_file} was not found; "
+                                   f"it was removed from the aliases, regenerate it manually.")
+                continue
+            unreal.log(f"🔁 '{alias}' no longer matches its material, processing {alias_file} again.")
+            json_files.append(alias_file)
+        progress["maximum"] = len(json_files)
+
+    idx = 0
+    while idx < len(json_files):
+        json_file = json_files[idx]
+        idx += 1
         full_path = os.path.join(folder_path, json_file)
         unreal.log(f"📄 Processing: {full_path}")
         try:
@@ -126,11 +294,41 @@ def process_json_folder_with_progress(folder_path):
             unreal.log_warning(f"⚠️ No textures found in {json_file}")
             continue
 
-        create_material_from_textures(material_name, texture_params)
+        # Always re-checked: an alias whose textures changed must be rebuilt or re-pointed
+        signature = texture_signature(texture_params)
+        canonical = dedup.canonical_for(signature)
+        if canonical and canonical != material_name:
+            if dedup.aliases.get(material_name) != canonical:
+                unreal.log(f"🔁 '{material_name}' uses the same textures as '{canonical}', recorded as alias.")
+            requeue(dedup.add_alias(material_name, canonical, signature, json_file))
+            aliased += 1
+            progress["value"] = idx
+            root.update_idletasks()
+            continue
+        if material_name in dedup.aliases:
+            unreal.log(f"🔁 '{material_name}' no longer matches '{dedup.aliases[material_name]}', building it.")
+
+        if USE_MATERIAL_INSTANCES:
+            created = create_material_instance_from_textures(material_name, texture_params)
+        else:
+            created = create_material_from_textures(material_name, texture_params)
+        if created:
+            requeue(dedup.add(material_name, signature, json_file))
+        else:
+            # a stale alias would keep pointing meshes at the wrong material
+            dedup.drop_alias(material_name)
 
         progress["value"] = idx
         root.update_idletasks()
 
+    if BULK_COMPILE:
+        label.config(text="Compiling materials...")
+        root.update_idletasks()
+        compile_pending_assets()
+
+    dedup.save()
+    unreal.log(f"🔁 {aliased} materials collapsed into existing ones, aliases saved to {dedup.path}")
+
     label.config(text="Done!")
     root.after(1500, root.destroy)
     root.mainloop()
@@ -142,8 +340,14 @@ def choose_json_folder():
     return folder_path
 
 # Run the full process
-selected_folder = choose_json_folder()
-if selected_folder:
-    process_json_folder_with_progress(selected_folder)
+changed_files = pipeline_files()
+if changed_files:
+    # Started by run_pipeline.py: only the material JSONs that changed
+    process_json_folder_with_progress(
+        os.path.dirname(changed_files[0]), {os.path.basename(f) for f in changed_files})
 else:
-    unreal.log_warning("❌ No folder selected. Exiting.")
+    selected_folder = choose_json_folder()
+    if selected_folder:
+        process_json_folder_with_progress(selected_folder)
+    else:
+        unreal.log_warning("❌ No folder selected. Exiting.")
@@ -1,38 +1,143 @@
 import unreal
 import os
+import sys
 import json
 
+# === Make Fnaf_mod_tool/core importable ===
+try:
+    TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+except NameError:
+    TOOL_DIR = "H:/f/Fnaf_mod_tool"
+if TOOL_DIR not in sys.path:
+    sys.path.append(TOOL_DIR)
+
+from core.material_dedup import load_material_aliases
+from core.pipeline import pipeline_files
+
 # ======= CONFIGURATION =======
 JSON_FOLDER = r"H:\f\Fnaf_mod_tool\fnaf9\Content\json\other"
 MATERIAL_SEARCH_FOLDER = '/Game/GeneratedMaterials'  # Folder to search for materials
 DEFAULT_MATERIAL_PATH = '/Game/Materials/FailNoMatirealFound'  # Fallback material
+MESH_SEARCH_FOLDER = '/Game'  # Folder to search for static meshes
+MESH_CHUNK_SIZE = 200  # Meshes loaded at once; released before the next chunk
+SAVE_BATCH_SIZE = 100  # Dirty mesh packages written per save_packages call
+MATERIAL_ALIAS_FILE = r"H:\f\Fnaf_mod_tool\fnaf9\Content\json\mats\material_aliases.json"  # Written by AutoMaterialGenerator_V5
 # ==============================
 
-def load_material_by_name(name, slot_index=0):
-    assets = unreal.EditorAssetLibrary.list_assets(MATERIAL_SEARCH_FOLDER, recursive=True, include_folder=False)
-    for asset_path in assets:
-        if asset_path.endswith(name) or asset_path.endswith(name + '.' + name):
+class MaterialResolver:
+    # Lists MATERIAL_SEARCH_FOLDER once and remembers every material it loads,
+    # so each slot is a dict lookup instead of a folder listing.
+    def __init__(self, search_folder, fallback_path, alias_file=None):
+        self.search_folder = search_folder
+        self.fallback_path = fallback_path
+        self.aliases = load_material_aliases(alias_file)
+        self.paths = {}
+        self.loaded = {}
+        self._fallback = None
+        self._fallback_loaded = False
+
+        assets = unreal.EditorAssetLibrary.list_assets(search_folder, recursive=True, include_folder=False)
+        for asset_path in assets:
+            short_name = asset_path.rsplit('/', 1)[-1].split('.')[0]
+            self.paths.setdefault(short_name, asset_path)
+            self.paths.setdefault(short_name.lower(), asset_path)
+        unreal.log(f"Indexed {len(assets)} assets under {search_folder}, {len(self.aliases)} material aliases")
+
+    def fallback(self):
+        if not self._fallback_loaded:
+            self._fallback_loaded = True
+            default_mat = unreal.EditorAssetLibrary.load_asset(self.fallback_path)
+            if default_mat and isinstance(default_mat, unreal.MaterialInterface):
+                self._fallback = default_mat
+        return self._fallback
+
+    def find(self, name):
+        if name in self.loaded:
+            return self.loaded[name]
+        material = None
+        # Deduplicated materials point at the one that was actually built
+        built_name = self.aliases.get(name, name)
+        asset_path = self.paths.get(built_name) or self.paths.get(built_name.lower())
+        if asset_path:
             asset = unreal.EditorAssetLibrary.load_asset(asset_path)
             if isinstance(asset, unreal.MaterialInterface):
-                return asset
-
-    # Fallback
-    default_mat = unreal.EditorAssetLibrary.load_asset(DEFAULT_MATERIAL_PATH)
-    if default_mat and isinstance(default_mat, unreal.MaterialInterface):
-        unreal.log_warning(f"Material '{name}' not found for slot {slot_index}, using fallback.")
-        return default_mat
-
-    unreal.log_error(f"Material '{name}' not found and fallback material is invalid.")
-    return None
-
-def find_all_static_meshes():
-    meshes = []
-    assets = unreal.EditorAssetLibrary.list_assets('/Game', recursive=True, include_folder=False)
-    for asset_path in assets:
-        asset = unreal.EditorAssetLibrary.load_asset(asset_path)
-        if isinstance(asset, unreal.StaticMesh):
-            meshes.append(asset)
-    return meshes
+                material = asset
+        self.loaded[name] = material
+        return material
+
+    def load_material_by_name(self, name, slot_index=0):
+        material = self.find(name)
+        if material:
+            return material
+
+        # Fallback
+        default_mat = self.fallback()
+        if default_mat:
+            unreal.log_warning(f"Material '{name}' not found for slot {slot_index}, using fallback.")
+            return default_mat
+
+        unreal.log_error(f"Material '{name}' not found and fallback material is invalid.")
+        return None
+
+class PackageSaveBatch:
+    # Collects dirty mesh packages and writes them with one save_packages call
+    # per batch instead of a save_asset call per material slot.
+    def __init__(self, batch_size=SAVE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.pending = {}
+        self.saved = 0
+
+    def add(self, asset):
+        package = asset.get_outermost()
+        self.pending[package.get_path_name()] = package
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        packages = list(self.pending.values())
+        self.pending = {}
+        if unreal.EditorLoadingAndSavingUtils.save_packages(packages, True):
+            self.saved += len(packages)
+            unreal.log(f"Saved {len(packages)} mesh packages ({self.saved} total)")
+        else:
+            unreal.log_error(f"Failed to save some of {len(packages)} mesh packages")
+
+def find_static_meshes_with_json(only=None):
+    # Ask the AssetRegistry for StaticMesh asset data only (nothing is loaded)
+    # and keep the ones that have a matching JSON file (and are in ``only``).
+    json_names = {
+        os.path.splitext(f)[0].lower()
+        for f in os.listdir(JSON_FOLDER)
+        if f.lower().endswith(".json")
+    }
+    if only is not None:
+        json_names &= only
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    ar_filter = unreal.ARFilter(
+        class_names=["StaticMesh"],
+        package_paths=[MESH_SEARCH_FOLDER],
+        recursive_paths=True,
+    )
+    mesh_assets = asset_registry.get_assets(ar_filter)
+    matched = [a for a in mesh_assets if str(a.asset_name).lower() in json_names]
+    unreal.log(f"Found {len(mesh_assets)} static meshes, {len(matched)} with a JSON")
+    return matched
+
+def iter_mesh_chunks(mesh_assets, chunk_size=MESH_CHUNK_SIZE):
+    for start in range(0, len(mesh_assets), chunk_size):
+        chunk = []
+        for asset_data in mesh_assets[start:start + chunk_size]:
+            mesh = asset_data.get_asset()
+            if isinstance(mesh, unreal.StaticMesh):
+                chunk.append(mesh)
+            else:
+                chunk.append(None)
+        yield chunk
+        # Drop our references so the chunk can be garbage collected
+        del chunk
+        unreal.SystemLibrary.collect_garbage()
 
 def load_json_for_mesh(mesh_name):
     json_path = os.path.join(JSON_FOLDER, mesh_name + ".json")
@@ -62,38 +167,65 @@ def get_material_names_from_json(json_data):
                                     material_names.append(material_name)
     return material_names
 
-def main():
-    meshes = find_all_static_meshes()
-    total_meshes = len(meshes)
+def assign_materials(mesh, resolver, saver, task, remaining):
+    mesh_name = os.path.basename(mesh.get_name())
+    task.enter_progress_frame(1, f"[{remaining} remaining] Processing: {mesh_name}")
 
-    with unreal.ScopedSlowTask(total_meshes, 'Assigning materials to meshes...') as task:
-        task.make_dialog(True)
+    json_data = load_json_for_mesh(mesh_name)
+    if not json_data:
+        unreal.log_warning(f"Skipping {mesh_name} (no JSON found)")
+        return
+
+    material_names = get_material_names_from_json(json_data)
+    if not material_names:
+        unreal.log_warning(f"Skipping {mesh_name} (no materials found in JSON)")
+        return
 
-        for i, mesh in enumerate(meshes):
-            if task.should_cancel():
-                break
+    assigned = 0
+    for idx, material_name in enumerate(material_names):
+        material_asset = resolver.load_material_by_name(material_name, idx)
+        if material_asset:
+            mesh.set_material(idx, material_asset)
+            assigned += 1
+            unreal.log(f"Assigned material '{material_name}' to slot {idx} on '{mesh_name}'")
 
-            mesh_name = os.path.basename(mesh.get_name())
-            remaining = total_meshes - i
-            task.enter_progress_frame(1, f"[{remaining} remaining] Processing: {mesh_name}")
+    # Saved once per mesh, in bulk with other meshes
+    if assigned:
+        saver.add(mesh)
 
-            json_data = load_json_for_mesh(mesh_name)
-            if not json_data:
-                unreal.log_warning(f"Skipping {mesh_name} (no JSON found)")
-                continue
+def main(only=None):
+    resolver = MaterialResolver(MATERIAL_SEARCH_FOLDER, DEFAULT_MATERIAL_PATH, MATERIAL_ALIAS_FILE)
+    mesh_assets = find_static_meshes_with_json(only)
+    total_meshes = len(mesh_assets)
 
-            material_names = get_material_names_from_json(json_data)
-            if not material_names:
-                unreal.log_warning(f"Skipping {mesh_name} (no materials found in JSON)")
-                continue
+    saver = PackageSaveBatch()
+
+    with unreal.ScopedSlowTask(total_meshes, 'Assigning materials to meshes...') as task:
+        task.make_dialog(True)
 
-            for idx, material_name in enumerate(material_names):
-                material_asset = load_material_by_name(material_name, idx)
-                if material_asset:
-                    mesh.set_material(idx, material_asset)
-                    unreal.EditorAssetLibrary.save_asset(mesh.get_path_name())
-                    unreal.log(f"Assigned material '{material_name}' to slot {idx} on '{mesh_name}'")
+        i = 0
+        try:
+            for chunk in iter_mesh_chunks(mesh_assets):
+                if task.should_cancel():
+                    break
+                for mesh in chunk:
+                    if task.should_cancel():
+                        break
+                    remaining = total_meshes - i
+                    i += 1
+                    if mesh is None:
+                        task.enter_progress_frame(1, f"[{remaining} remaining] Skipping asset that failed to load")
+                        continue
+                    assign_materials(mesh, resolver, saver, task, remaining)
+                # Write this chunk's meshes before they are released
+                saver.flush()
+                chunk = mesh = None
+        finally:
+            # Also runs when the dialog is cancelled
+            saver.flush()
 
     unreal.log("Material assignment finished.")
 
-main()
+# Started by run_pipeline.py: only the meshes whose JSON changed
+changed_files = pipeline_files()
+main(None if changed_files is None else {os.path.splitext(os.path.basename(f))[0].lower() for f in changed_files})
@@ -1,6 +1,12 @@
 import os
+import sys
 import bpy
 from io_import_scene_unreal_psa_psk_280 import pskimport
+
+# Make Fnaf_mod_tool/core importable
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.scene_reset import SceneTracker
+
 #Change Me
 psk_folder = r"H:\f\Fnaf_mod_tool\assetspsk"
 fbx_output_folder = r"H:\f\Fnaf_mod_tool\exports"
@@ -9,6 +15,9 @@ bReorientBones = False
 # ✅ Make sure the export folder exists
 os.makedirs(fbx_output_folder, exist_ok=True)
 
+# 🧹 Clear the startup scene once; each file then only frees what its import created
+scene_tracker = SceneTracker(bpy)
+
 for filename in os.listdir(psk_folder):
     if filename.lower().endswith(".psk"):
         filepath = os.path.join(psk_folder, filename)
@@ -16,9 +25,7 @@ for filename in os.listdir(psk_folder):
 
         try:
             # 🧹 Clear scene
-            bpy.ops.object.select_all(action='SELECT')
-            bpy.ops.object.delete(use_global=False)
-            bpy.ops.outliner.orphans_purge(do_recursive=True)
+            scene_tracker.reset()
 
             # 🔍 Track objects before import
             before = set(bpy.context.scene.objects)
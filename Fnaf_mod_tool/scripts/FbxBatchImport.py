@@ -0,0 +1,81 @@
+import unreal
+import os
+import sys
+
+# === Make Fnaf_mod_tool/core importable ===
+try:
+    TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+except NameError:
+    TOOL_DIR = "H:/f/Fnaf_mod_tool"
+if TOOL_DIR not in sys.path:
+    sys.path.append(TOOL_DIR)
+
+from core.pipeline import pipeline_files
+
+# Imports the FBX files placed next to their .uasset (PowerShellFbxImporter.txt)
+# into the matching /Game folder. Started by run_pipeline.py with the list of
+# new or changed FBX files; without a list every FBX under CONTENT_DIR is imported.
+
+# ======= CONFIGURATION =======
+CONTENT_DIR = "H:/f/Fnaf_mod_tool/fnaf9/Content"
+CONTENT_ROOT = "/Game"
+IMPORT_BATCH_SIZE = 50  # FBX files per import_asset_tasks call
+# ==============================
+
+def find_fbx_files(folder):
+    fbx_files = []
+    for root, _, files in os.walk(folder):
+        for file in files:
+            if file.lower().endswith(".fbx"):
+                fbx_files.append(os.path.join(root, file))
+    return fbx_files
+
+def destination_for(fbx_path):
+    rel_dir = os.path.relpath(os.path.dirname(fbx_path), CONTENT_DIR).replace("\\", "/")
+    if rel_dir == ".":
+        return CONTENT_ROOT
+    return f"{CONTENT_ROOT}/{rel_dir}"
+
+def make_import_task(fbx_path):
+    options = unreal.FbxImportUI()
+    options.set_editor_property("import_mesh", True)
+    options.set_editor_property("import_as_skeletal", False)
+    options.set_editor_property("import_materials", False)
+    options.set_editor_property("import_textures", False)
+    options.set_editor_property("mesh_type_to_import", unreal.FBXImportType.FBXIT_STATIC_MESH)
+
+    task = unreal.AssetImportTask()
+    task.set_editor_property("filename", fbx_path)
+    task.set_editor_property("destination_path", destination_for(fbx_path))
+    task.set_editor_property("automated", True)
+    task.set_editor_property("replace_existing", True)
+    task.set_editor_property("save", True)
+    task.set_editor_property("options", options)
+    return task
+
+def main(fbx_files):
+    asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+    failed = []
+    imported = 0
+
+    with unreal.ScopedSlowTask(len(fbx_files), "Importing FBX files...") as slow_task:
+        slow_task.make_dialog(True)
+        for start in range(0, len(fbx_files), IMPORT_BATCH_SIZE):
+            if slow_task.should_cancel():
+                break
+            batch = fbx_files[start:start + IMPORT_BATCH_SIZE]
+            tasks = [make_import_task(path) for path in batch]
+            asset_tools.import_asset_tasks(tasks)
+            for path, task in zip(batch, tasks):
+                if task.get_editor_property("imported_object_paths"):
+                    imported += 1
+                else:
+                    failed.append(path)
+            slow_task.enter_progress_frame(len(batch), f"Imported {imported}/{len(fbx_files)}")
+
+    unreal.log(f"📦 Imported {imported} FBX files")
+    for path in failed:
+        unreal.log_error(f"❌ Failed to import {path}")
+
+changed_files = pipeline_files()
+main(changed_files if changed_files is not None else find_fbx_files(CONTENT_DIR))
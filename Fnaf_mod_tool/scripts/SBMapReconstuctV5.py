@@ -1,9 +1,25 @@
 import unreal
-import json
 import os
+import sys
+import json
 import tkinter as tk
 from tkinter import filedialog
 
+# === Make Fnaf_mod_tool/core importable ===
+try:
+    TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+except NameError:
+    TOOL_DIR = "H:/f/Fnaf_mod_tool"
+if TOOL_DIR not in sys.path:
+    sys.path.append(TOOL_DIR)
+
+from core.asset_index import load_asset_index
+from core.instancing import Placement, group_placements, load_instance_actor_class, spawn_instanced_group
+from core.pipeline import pipeline_files
+from core.map_partition import load_shard_job
+from core.spawn_plan import SpawnPlan, load_or_compile_plan, report
+from core.transforms import AXIS_CONVERSIONS, convert_transforms
+
 # === TKINTER File Dialog ===
 def choose_json_file():
     root = tk.Tk()
@@ -16,10 +32,24 @@ def choose_json_file():
     return file_path if file_path else None
 
 # === Create or Load Map with JSON filename ===
-def create_new_map_from_json(json_path, save_path="/Game/Maps/RecreatedMaps"):
+def recreate_level(level):
+    """Delete ``level`` if it exists and create it empty, so a rerun doesn't spawn everything twice."""
+    if unreal.EditorAssetLibrary.does_asset_exist(level):
+        unreal.EditorAssetLibrary.delete_asset(level)
+    if not unreal.EditorLevelLibrary.new_level(level):
+        unreal.log_error(f"❌ Could not create level {level}")
+        return False
+    return True
+
+def create_new_map_from_json(json_path, save_path="/Game/Maps/RecreatedMaps", replace=False):
     json_name = os.path.splitext(os.path.basename(json_path))[0]
     full_asset_path = f"{save_path}/{json_name}"
 
+    if replace:
+        if not unreal.EditorAssetLibrary.does_directory_exist(save_path):
+            unreal.EditorAssetLibrary.make_directory(save_path)
+        return full_asset_path if recreate_level(full_asset_path) else None
+
     if unreal.EditorAssetLibrary.does_asset_exist(full_asset_path):
         unreal.EditorLevelLibrary.load_level(full_asset_path)
         unreal.log_warning(f"⚠️ Level {full_asset_path} already exists. Loading it instead.")
@@ -36,42 +66,64 @@ def create_new_map_from_json(json_path, save_path="/Game/Maps/RecreatedMaps"):
         unreal.log_error(f"❌ Failed to create the level: {e}")
         return None
 
-# === Main ===
-json_path = choose_json_file()
-if not json_path:
-    unreal.log_error("No JSON file selected. Aborting.")
-    raise SystemExit()
-
-with open(json_path, 'r') as f:
-    data = json.load(f)
-
+# === Configuration ===
 content_root = "/Game/"
 content_dir = "H:/f/Fnaf_mod_tool/fnaf9/Content/"
 GLOBAL_SCALE = unreal.Vector(1.0, 1.0, 1.0)
-spawned_count = 0
+SCALE_CLAMP = None  # e.g. (0.01, 100.0) to clamp every scale axis into that range
+AXIS_CONVERSION = None  # None keeps UE axes; "mirror_y" for right-handed exports
+
+# === Instancing ===
+# Meshes placed at least INSTANCE_MIN_COUNT times with the same material
+# overrides become one actor with a HierarchicalInstancedStaticMeshComponent.
+INSTANCE_REPEATED_MESHES = True
+INSTANCE_MIN_COUNT = 20
+# Blueprint asset with a HISM root component, e.g. "/Game/Blueprints/BP_HISM".
+# Required for instancing: without it every mesh is placed as its own StaticMeshActor.
+INSTANCE_ACTOR_CLASS = None
+
+# === Region of interest ===
+# Only spawn exports whose bounds intersect this region, e.g.
+# {"box": [[x1, y1, z1], [x2, y2, z2]]} or {"center": [x, y, z], "radius": 5000}.
+# None rebuilds the whole map. FNAF_MAP_REGION (same JSON) overrides it.
+REGION = None
+REGION_ENV = "FNAF_MAP_REGION"
 
-created_map = create_new_map_from_json(json_path)
-if not created_map:
-    unreal.log_error("Could not create or load a map. Aborting.")
-    raise SystemExit()
+def map_region():
+    if os.environ.get(REGION_ENV):
+        return json.loads(os.environ[REGION_ENV])
+    return REGION
+
+# One scan of content_dir (cached on disk) instead of a walk per mesh
+asset_index = load_asset_index(content_dir, content_root)
+unreal.log(f"🗂️ Asset index: {len(asset_index.names)} names, {asset_index.changed_dirs} folders re-scanned")
 
 # === Helper functions ===
 
-def safe_scale(vec):
-    return unreal.Vector(
-        max(min(vec.x, 100.0), 0.01),
-        max(min(vec.y, 100.0), 0.01),
-        max(min(vec.z, 100.0), 0.01)
-    )
+def to_vector(xyz):
+    return unreal.Vector(xyz[0], xyz[1], xyz[2])
+
+def to_rotator(rpy):
+    return unreal.Rotator(rpy[0], rpy[1], rpy[2])
 
-def create_convex_brush(convex_elem, location, rotation, scale, name):
-    verts = convex_elem.get("VertexData", [])
+def converted_transforms(entries):
+    """(location, rotation, scale) per plan entry; clamping, global scale and axis
+    conversion run over the whole section at once (NumPy when installed)."""
+    global_scale = (GLOBAL_SCALE.x, GLOBAL_SCALE.y, GLOBAL_SCALE.z)
+    transforms = convert_transforms(entries, global_scale, SCALE_CLAMP, AXIS_CONVERSION)
+    return [(to_vector(loc), to_rotator(rot), to_vector(scl)) for loc, rot, scl in transforms]
+
+def create_convex_brush(spawn, transform):
+    verts = spawn.verts
     if not verts:
         return None
-    brush = unreal.EditorLevelLibrary.spawn_actor_from_class(unreal.Brush, location, rotation)
+    name = spawn.name
+    loc, rot, scale = transform
+    brush = unreal.EditorLevelLibrary.spawn_actor_from_class(unreal.Brush, loc, rot)
     if not brush:
         return None
-    converted = [unreal.Vector(v["X"] * scale.x, v["Y"] * scale.y, v["Z"] * scale.z) for v in verts]
+    sx, sy, sz = (v * s for v, s in zip((scale.x, scale.y, scale.z), AXIS_CONVERSIONS[AXIS_CONVERSION][0]))
+    converted = [unreal.Vector(v[0] * sx, v[1] * sy, v[2] * sz) for v in verts]
     builder = unreal.BrushBuilder()
     builder.poly_flag = 0
     builder.vertices = converted
@@ -79,9 +131,9 @@ def create_convex_brush(convex_elem, location, rotation, scale, name):
     print(f"🧱 Created convex brush for {name} with {len(converted)} verts")
     return brush
 
-def spawn_light_actor(obj_type, props, name, rot, scl):
-    loc_data = props.get("RelativeLocation", {"X": 0, "Y": 0, "Z": 0})
-    loc = unreal.Vector(loc_data["X"], loc_data["Y"], loc_data["Z"])
+def spawn_light_actor(spawn, transform):
+    obj_type, props, name = spawn.type, spawn.props, spawn.name
+    loc, rot, scl = transform
     light_class_map = {
         "PointLightComponent": unreal.PointLight,
         "SpotLightComponent": unreal.SpotLight,
@@ -121,72 +173,201 @@ def spawn_light_actor(obj_type, props, name, rot, scl):
                 print(f"⚠️ Could not set property '{uprop}': {e}")
     print(f"💡 Spawned {obj_type}: {name} at {loc} with rotation {rot} and scale {scl}")
 
-# === Main spawning loop ===
-
-for obj in data:
-    props = obj.get("Properties") or {}
-    obj_type = obj.get("Type", "")
-    name = obj.get("Name", "Unnamed")
-    location = obj.get("RelativeLocation") or props.get("RelativeLocation", {"X": 0, "Y": 0, "Z": 0})
-    rotation = obj.get("RelativeRotation") or props.get("RelativeRotation", {"Pitch": 0, "Yaw": 0, "Roll": 0})
-    scale = props.get("RelativeScale3D", {"X": 1, "Y": 1, "Z": 1})
-    loc = unreal.Vector(location["X"], location["Y"], location["Z"])
-    rot = unreal.Rotator(rotation["Roll"], rotation["Pitch"], rotation["Yaw"])
-    scl = unreal.Vector(scale["X"], scale["Y"], scale["Z"]) * GLOBAL_SCALE
-
-    if obj_type in ["PointLightComponent", "SpotLightComponent", "RectLightComponent"]:
-        spawn_light_actor(obj_type, props, name, rot, scl)
-        spawned_count += 1
-        continue
-
-    if obj_type == "BlockingVolume" and "BodySetup" in props:
-        convex_elems = props["BodySetup"].get("AggGeom", {}).get("ConvexElems", [])
-        for i, convex in enumerate(convex_elems):
-            create_convex_brush(convex, loc, rot, scl, f"{name}_Part{i}")
-            spawned_count += 1
-        continue
-
-    elif "StaticMesh" in props and isinstance(props["StaticMesh"], dict):
-        mesh_path_raw = props["StaticMesh"].get("ObjectPath", "")
-        if mesh_path_raw:
-            mesh_file = os.path.basename(mesh_path_raw).split(".")[0]
-            print(f"🕵️‍♂️ Searching for mesh: {mesh_file}")
-            found_path = None
-            for root, _, files in os.walk(content_dir):
-                for file in files:
-                    if file.lower() == mesh_file.lower() + ".uasset":
-                        relative = os.path.relpath(root, content_dir).replace("\\", "/")
-                        found_path = content_root + relative + "/" + mesh_file
-                        print(f"✅ Found asset: {found_path}")
-                        break
-                if found_path:
-                    break
-            if found_path:
-                static_mesh = unreal.EditorAssetLibrary.load_asset(found_path)
-                if static_mesh and isinstance(static_mesh, unreal.StaticMesh):
-                    actor = unreal.EditorLevelLibrary.spawn_actor_from_class(unreal.StaticMeshActor, loc, rot)
-                    if actor:
-                        actor.set_actor_scale3d(scl)
-                        actor.set_actor_label(name)
-                        smc = actor.static_mesh_component
-                        smc.set_static_mesh(static_mesh)
-                        smc.set_editor_property("mobility", unreal.ComponentMobility.MOVABLE)
-                        print(f"🧱 Placed StaticMeshActor: {name} using mesh {found_path}")
-                        spawned_count += 1
-                    else:
-                        print(f"❌ Failed to spawn actor for {name}")
-                else:
-                    print(f"⚠️ Asset found but not a valid StaticMesh: {found_path} for {name}")
-            else:
-                print(f"❌ Could not locate asset for mesh: {mesh_file} (original path: {mesh_path_raw})")
-        continue
-
-    actor_class = unreal.BlockingVolume if obj_type == "BlockingVolume" else unreal.Actor
-    actor = unreal.EditorLevelLibrary.spawn_actor_from_class(actor_class, loc, rot)
-    if actor:
-        actor.set_actor_scale3d(scl)
-        actor.set_actor_label(name)
-        spawned_count += 1
-        print(f"✅ Spawned {obj_type}: {name} at {loc} with rotation {rot} and scale {scl}")
+_loaded_assets = {}
+_instance_actor_class = False  # not loaded yet; None once loading failed
+
+def get_instance_actor_class():
+    global _instance_actor_class
+    if _instance_actor_class is False:
+        _instance_actor_class = load_instance_actor_class(unreal, INSTANCE_ACTOR_CLASS)
+    return _instance_actor_class
+
+def load_cached_asset(path, asset_class):
+    if path not in _loaded_assets:
+        asset = unreal.EditorAssetLibrary.load_asset(path)
+        _loaded_assets[path] = asset if asset and isinstance(asset, asset_class) else None
+    return _loaded_assets[path]
+
+def load_override_materials(material_paths):
+    # Paths were resolved through the asset index when the plan was compiled
+    return [load_cached_asset(path, unreal.MaterialInterface) if path else None for path in material_paths]
+
+def spawn_static_mesh_actor(placement, static_mesh):
+    actor = unreal.EditorLevelLibrary.spawn_actor_from_class(unreal.StaticMeshActor, placement.location, placement.rotation)
+    if not actor:
+        print(f"❌ Failed to spawn actor for {placement.name}")
+        return False
+    actor.set_actor_scale3d(placement.scale)
+    actor.set_actor_label(placement.name)
+    smc = actor.static_mesh_component
+    smc.set_static_mesh(static_mesh)
+    smc.set_editor_property("mobility", unreal.ComponentMobility.MOVABLE)
+    for slot, material in enumerate(load_override_materials(placement.overrides)):
+        if material:
+            smc.set_material(slot, material)
+    print(f"🧱 Placed StaticMeshActor: {placement.name} using mesh {placement.mesh_path}")
+    return True
+
+def spawn_mesh_placements(placements):
+    count = 0
+    actor_class = get_instance_actor_class() if INSTANCE_REPEATED_MESHES else None
+    if actor_class:
+        groups, singles = group_placements(placements, INSTANCE_MIN_COUNT)
+    else:
+        groups, singles = [], placements
+
+    for group in groups:
+        static_mesh = load_cached_asset(group.mesh_path, unreal.StaticMesh)
+        actor = spawn_instanced_group(unreal, static_mesh, group, load_override_materials(group.overrides), actor_class)
+        if actor:
+            print(f"🧩 Instanced {len(group.placements)} placements of {group.mesh_path}")
+            count += len(group.placements)
+        else:
+            print(f"❌ Failed to spawn instanced actor for {group.mesh_path}, placing individually")
+            singles.extend(group.placements)
+
+    for placement in singles:
+        if spawn_static_mesh_actor(placement, load_cached_asset(placement.mesh_path, unreal.StaticMesh)):
+            count += 1
+    return count
+
+# === Plan replay ===
+
+def spawn_plan(plan):
+    """Spawn every entry of a SpawnPlan into the current level; returns the number placed."""
+    count = 0
+    for light, transform in zip(plan.lights, converted_transforms(plan.lights)):
+        spawn_light_actor(light, transform)
+        count += 1
+
+    for brush, transform in zip(plan.brushes, converted_transforms(plan.brushes)):
+        create_convex_brush(brush, transform)
+        count += 1
+
+    for spawn, (loc, rot, scl) in zip(plan.actors, converted_transforms(plan.actors)):
+        actor_class = unreal.BlockingVolume if spawn.type == "BlockingVolume" else unreal.Actor
+        actor = unreal.EditorLevelLibrary.spawn_actor_from_class(actor_class, loc, rot)
+        if actor:
+            actor.set_actor_scale3d(scl)
+            actor.set_actor_label(spawn.name)
+            count += 1
+            print(f"✅ Spawned {spawn.type}: {spawn.name} at {loc} with rotation {rot} and scale {scl}")
+
+    mesh_placements = []
+    for spawn, (loc, rot, scl) in zip(plan.meshes, converted_transforms(plan.meshes)):
+        if load_cached_asset(spawn.mesh_path, unreal.StaticMesh):
+            # Spawned together so repeated meshes can be instanced
+            mesh_placements.append(Placement(spawn.name, spawn.mesh_path, tuple(spawn.materials), loc, rot, scl))
+        else:
+            print(f"⚠️ Asset found but not a valid StaticMesh: {spawn.mesh_path} for {spawn.name}")
+    count += spawn_mesh_placements(mesh_placements)
+
+    for mesh_file, missing in sorted(plan.unresolved.items()):
+        print(f"❌ Could not locate asset for mesh: {mesh_file} ({missing} placements)")
+    return count
+
+# === Sharded mode ===
+# reconstruct_sharded.py compiles the spawn plan, then starts one editor per
+# group of grid cells with a job listing the cells' export indices, then one
+# more to build the persistent level. The persistent level uses World
+# Composition: every cell map in its folder is a tile, nothing but the
+# persistent level loads when it is opened in the editor (tiles are loaded
+# from the World Browser), and at runtime tiles stream in and out by distance
+# (World Composition's default layer: within 50000 units of the player).
+
+def run_cell_job(job):
+    with open(job["plan_path"], "r", encoding="utf-8") as f:
+        plan = SpawnPlan.from_json(json.load(f))
+
+    total = built = 0
+    for cell in job["cells"]:
+        level = cell["level"]
+        if not recreate_level(level):
+            continue
+        count = spawn_plan(plan.subset(cell["indices"]))
+        if not unreal.EditorLevelLibrary.save_current_level():
+            unreal.log_error(f"❌ Could not save cell level {level}")
+            continue
+        unreal.log(f"🧩 {level}: {count} objects")
+        total += count
+        built += 1
+    return total, built
+
+def remove_stale_cells(cells_dir, sublevels):
+    # Every map under the persistent level's folder becomes a tile, including
+    # cells left over from a run with a different cell size
+    keep = set(sublevels)
+    for asset_path in unreal.EditorAssetLibrary.list_assets(cells_dir, recursive=True):
+        level = asset_path.split(".", 1)[0]
+        if level not in keep:
+            unreal.EditorAssetLibrary.delete_asset(level)
+            unreal.log(f"🗑️ Removed stale cell {level}")
+
+def run_persistent_job(job):
+    """Build the World Composition persistent level; returns the number of cell tiles, or None on failure."""
+    persistent = job["persistent"]
+    missing = [level for level in job["sublevels"] if not unreal.EditorAssetLibrary.does_asset_exist(level)]
+    for level in missing:
+        unreal.log_error(f"❌ Cell level {level} was not built")
+    if unreal.EditorAssetLibrary.does_directory_exist(job["cells_dir"]):
+        remove_stale_cells(job["cells_dir"], job["sublevels"])
+
+    # Rebuilt every time; World Composition can only be enabled on a map that is already saved
+    if not recreate_level(persistent) or not unreal.EditorLevelLibrary.save_current_level():
+        unreal.log_error(f"❌ Could not create persistent level {persistent}")
+        return None
+    world_settings = unreal.EditorLevelLibrary.get_editor_world().get_world_settings()
+    world_settings.set_editor_property("enable_world_composition", True)
+    if not world_settings.get_editor_property("enable_world_composition"):
+        unreal.log_error(f"❌ The editor refused to enable World Composition on {persistent}")
+        return None
+    if not unreal.EditorLevelLibrary.save_current_level():
+        unreal.log_error(f"❌ Could not save persistent level {persistent}")
+        return None
+    tiles = len(job["sublevels"]) - len(missing)
+    unreal.log(f"🗺️ {persistent}: World Composition with {tiles} cell tiles")
+    return None if missing else tiles
+
+# === Main ===
+exit_code = 0
+shard_job = load_shard_job()
+if shard_job and "persistent" in shard_job:
+    if run_persistent_job(shard_job) is None:
+        exit_code = 1
+elif shard_job:
+    spawned_count, built = run_cell_job(shard_job)
+    print(f"🎉 Total objects placed: {spawned_count}")
+    if built < len(shard_job["cells"]):
+        exit_code = 1
+else:
+    # run_pipeline.py hands over the map JSON instead of asking
+    changed_files = pipeline_files()
+    json_path = changed_files[0] if changed_files else choose_json_file()
+    if not json_path:
+        unreal.log_error("No JSON file selected. Aborting.")
+        raise SystemExit()
+
+    # Headless pipeline runs rebuild the level from scratch and save it; the
+    # editor exits afterwards, so anything unsaved would be lost
+    created_map = create_new_map_from_json(json_path, replace=bool(changed_files))
+    if not created_map:
+        unreal.log_error("Could not create or load a map. Aborting.")
+        raise SystemExit(1)
+
+    # All JSON interpretation happens in the (cached) plan; the editor only replays it.
+    # With a region the plan is limited to exports intersecting it (core.spatial_index).
+    plan, from_cache = load_or_compile_plan(json_path, asset_index, map_region())
+    report(plan, from_cache)
+    spawned_count = spawn_plan(plan)
+    print(f"🎉 Total objects placed: {spawned_count}")
+    if changed_files:
+        if unreal.EditorLevelLibrary.save_current_level():
+            unreal.log(f"💾 Saved {created_map}")
+        else:
+            unreal.log_error(f"❌ Could not save {created_map}")
+            exit_code = 1
 
-print(f"🎉 Total objects placed: {spawned_count}")
+asset_index.save()
+asset_index.report_duplicates()
+if exit_code:
+    raise SystemExit(exit_code)
@@ -2,7 +2,7 @@ import os
 import sys
 import bpy
 import gc
-import json
+import time
 import subprocess
 import traceback
 
@@ -10,64 +10,33 @@ from blender_uasset_addon.import_uasset import load_uasset
 from blender_uasset_addon.export_as_fbx import export_as_fbx
 from blender_uasset_addon import bpy_util
 
+# === Make Fnaf_mod_tool/core importable ===
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.export_list import find_listed_uassets
+from core.export_pool import serve
+from core.scene_reset import SceneTracker
+from core.export_journal import ExportJournal
+
 # === CONFIGURATION ===
 UASSET_DIR = r"H:/depot_747661/fnaf9/Content/Paks/Newfolder/Exports/fnaf9/Content"
 UE_VERSION = "4.27"
 UASSET_LIST_FILE = "missing_files_report.txt"
 BATCH_SIZE = 1000
-STATE_FILE = "batch_state.json"
+JOURNAL_FILE = "export_journal.db"  # per-file outcome, written as each file finishes
+STATE_FILE = "batch_state.json"  # old progress file, imported into a new journal once
 
 # === CLEAN SCENE ===
-def clean_scene():
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    for collection in bpy.data.collections:
-        bpy.data.collections.remove(collection)
-    for datablocks in (
-        bpy.data.meshes, bpy.data.armatures, bpy.data.materials,
-        bpy.data.images, bpy.data.textures, bpy.data.objects
-    ):
-        for block in datablocks:
-            if block.users == 0:
-                datablocks.remove(block)
-
-# === STATE TRACKING ===
-def load_state():
-    if os.path.exists(STATE_FILE):
-        with open(STATE_FILE, 'r') as f:
-            return json.load(f)
-    return {"processed": []}
+# The startup scene is cleared once; after that only the datablocks an import
+# created are freed, in one bpy.data.batch_remove call
+scene_tracker = SceneTracker(bpy)
 
-def save_state(state):
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+def clean_scene():
+    scene_tracker.reset()
 
 # === GET .UASSET PATHS BY NAME ONLY ===
 def get_uassets_from_list():
-    if not os.path.exists(UASSET_LIST_FILE):
-        print(f"❌ List file not found: {UASSET_LIST_FILE}")
-        return []
-
-    with open(UASSET_LIST_FILE, 'r') as f:
-        listed_names = {
-            (name.strip().lower() + ".uasset")
-            for name in f
-            if name.strip() and "rig" not in name.lower() and "mat" not in name.lower()
-        }
-
-    print(f"🔍 Scanning {UASSET_DIR} for listed assets...")
-    matched_files = []
-    for root, _, files in os.walk(UASSET_DIR):
-        for file in files:
-            file_lc = file.lower()
-            if file_lc in listed_names:
-                full_path = os.path.join(root, file)
-                fbx_path = full_path[:-6] + ".fbx"
-                if not os.path.exists(fbx_path):
-                    matched_files.append(full_path)
-                    print(f"  ✅ Found match: {file}")
-    print(f"✅ Total matched files: {len(matched_files)}")
-    return matched_files
+    return find_listed_uassets(UASSET_DIR, UASSET_LIST_FILE)
 
 # === PROCESS FILE ===
 def process_uasset(file_path):
@@ -77,41 +46,42 @@ def process_uasset(file_path):
         obj, asset_type = load_uasset(file_path, load_textures=False, ue_version=UE_VERSION)
         if not obj:
             print(f"⚠️  No object returned for: {file_path}")
-            return False
+            return False, "no object returned"
         bpy_util.deselect_all()
         obj.select_set(True)
         armature, meshes = bpy_util.get_selected_armature_and_meshes()
         fbx_path = file_path[:-6] + ".fbx"
         export_as_fbx(fbx_path, armature, meshes)
         print(f"✅ Exported: {fbx_path}")
-        return True
+        return True, ""
     except Exception as e:
         print(f"❌ Error: {file_path} → {e}")
         traceback.print_exc()
-        return False
+        return False, str(e)
     finally:
         clean_scene()
         gc.collect()
 
 # === MAIN ===
 def main():
-    state = load_state()
-    processed = set(state.get("processed", []))
-    all_files = [f for f in get_uassets_from_list() if f not in processed]
+    journal = ExportJournal(JOURNAL_FILE, legacy_state=STATE_FILE)
+    # files that failed before are left for bulk_export_pool.py --retry-failed
+    all_files = journal.pending(get_uassets_from_list())
 
     if not all_files:
         print("🎉 All listed files processed or none found.")
+        journal.close()
         return
 
     for file_path in all_files[:BATCH_SIZE]:
-        success = process_uasset(file_path)
-        if success:
-            processed.add(file_path)
-        else:
+        start = time.time()
+        # a crash inside load_uasset leaves the file marked failed, so the relaunch skips it
+        journal.start(file_path)
+        success, error = process_uasset(file_path)
+        journal.record(file_path, success, error, time.time() - start, new_attempt=False)
+        if not success:
             print(f"⏭️ Skipped due to error: {file_path}")
-
-    state["processed"] = list(processed)
-    save_state(state)
+    journal.close()
 
     if len(all_files) > BATCH_SIZE:
         print("🔁 Relaunching for next batch...")
@@ -123,4 +93,8 @@ def main():
     else:
         print("✅ Done.")
 
-main()
+# Started by bulk_export_pool.py with "-- --worker": take files from stdin
+if "--worker" in sys.argv:
+    serve(process_uasset)
+else:
+    main()
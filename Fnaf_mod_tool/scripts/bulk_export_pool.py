@@ -0,0 +1,64 @@
+import os
+import sys
+import argparse
+
+# Runs bulk_export_new.py in several background Blender processes at once.
+# Run with normal Python (not inside Blender):
+#   python bulk_export_pool.py --workers 8
+#   python bulk_export_pool.py --fake      (test scheduling without Blender)
+#   python bulk_export_pool.py --retry-failed   (only files whose last export failed)
+#   python bulk_export_pool.py --retry-failed --include-quarantined   (also files that hung or crashed Blender)
+
+# === Make Fnaf_mod_tool/core importable ===
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.export_list import find_listed_uassets
+from core.export_pool import ASSET_TIMEOUT, QUARANTINE_PREFIX, ExportPool, fake_worker_cmd
+from core.export_journal import ExportJournal
+
+# === CONFIGURATION ===
+BLENDER_PATH = r"C:\Program Files\Blender Foundation\Blender 3.6\blender.exe"
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bulk_export_new.py")
+UASSET_DIR = r"H:/depot_747661/fnaf9/Content/Paks/Newfolder/Exports/fnaf9/Content"
+UASSET_LIST_FILE = "missing_files_report.txt"
+JOURNAL_FILE = "export_journal.db"
+STATE_FILE = "batch_state.json"  # old progress file, imported into a new journal once
+QUARANTINE_FILE = "quarantine_report.txt"  # files that hung or crashed Blender, for manual handling
+
+def blender_worker_cmd():
+    return [BLENDER_PATH, "--background", "--python", WORKER_SCRIPT, "--", "--worker"]
+
+# === MAIN ===
+def main():
+    parser = argparse.ArgumentParser(description="Parallel uasset -> FBX export")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Blender processes to run")
+    parser.add_argument("--fake", action="store_true", help="use a fake worker instead of Blender")
+    parser.add_argument("--quiet", action="store_true", help="hide worker log output")
+    parser.add_argument("--list", default=UASSET_LIST_FILE, help="names to export (missingUassetsfinder report)")
+    parser.add_argument("--journal", default=JOURNAL_FILE, help="SQLite progress journal")
+    parser.add_argument("--retry-failed", action="store_true", help="only retry files whose last export failed")
+    parser.add_argument("--include-quarantined", action="store_true",
+                        help="with --retry-failed, also retry files that hung or crashed a worker")
+    parser.add_argument("--timeout", type=float, default=ASSET_TIMEOUT, help="seconds per file before the worker is killed")
+    args = parser.parse_args()
+
+    with ExportJournal(args.journal, legacy_state=STATE_FILE) as journal:
+        if args.retry_failed:
+            # quarantined files would most likely hang or crash Blender again
+            all_files = [path for path, error, _, _ in journal.failures()
+                         if args.include_quarantined or not error.startswith(QUARANTINE_PREFIX)]
+        else:
+            all_files = journal.pending(find_listed_uassets(UASSET_DIR, args.list))
+
+        if not all_files:
+            print("🎉 All listed files processed or none found.")
+            return
+
+        worker_cmd = fake_worker_cmd() if args.fake else blender_worker_cmd()
+        print(f"🚀 Exporting {len(all_files)} files with {args.workers} workers")
+        pool = ExportPool(worker_cmd, workers=args.workers, journal=journal, verbose=not args.quiet,
+                          timeout=args.timeout, quarantine_file=QUARANTINE_FILE)
+        pool.run(all_files)
+
+if __name__ == "__main__":
+    main()
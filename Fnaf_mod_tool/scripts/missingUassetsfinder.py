@@ -1,5 +1,13 @@
 import os
-import json
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# === Make Fnaf_mod_tool/core importable ===
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.asset_index import load_asset_index
+from core.json_stream import iter_exports
 
 # Root folder where JSON files are stored recursively
 json_root = r"H:\f\Fnaf_mod_tool\fnaf9\Content\json\Maps"
@@ -40,42 +48,59 @@ def extract_referenced_names(json_data):
     recurse(json_data)
     return names
 
-def name_exists_somewhere(base_name, search_dirs):
+def get_available_names(search_dirs):
+    # One scan of every search dir (cached by core.asset_index) instead of a walk per name
+    available = set()
     for folder in search_dirs:
-        for root, _, files in os.walk(folder):
-            for file in files:
-                name, ext = os.path.splitext(file)
-                if ext.lower() == '.uasset' and name.lower() == base_name:
-                    return True
-    return False
-
-def main():
-    json_files = get_all_json_files(json_root)
-    report_lines = []
-
-    for json_file in json_files:
-        print(f"📄 Processing: {json_file}")
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except Exception as e:
-            print(f"❌ Failed to parse {json_file}: {e}")
+        if not os.path.isdir(folder):
+            print(f"⚠️ Search folder not found: {folder}")
             continue
+        available.update(load_asset_index(folder).names)
+    return available
+
+def scan_json_file(json_file):
+    # Runs in a worker process; streams the exports so big maps stay small
+    referenced_names = set()
+    try:
+        for export in iter_exports(json_file):
+            referenced_names |= extract_referenced_names(export)
+    except Exception as e:
+        return json_file, None, str(e)
+    return json_file, referenced_names, None
 
-        referenced_names = extract_referenced_names(data)
-        print(f"   🔍 Found {len(referenced_names)} referenced names")
+def main():
+    parser = argparse.ArgumentParser(description="Report names referenced by JSON exports that have no .uasset")
+    parser.add_argument("--workers", type=int, default=None, help="JSON parsing processes (default: CPU count)")
+    parser.add_argument("--sources", action="store_true",
+                        help="also write which JSON files referenced each missing name")
+    args = parser.parse_args()
 
-        missing = []
+    print(f"🔍 Indexing .uasset files in {len(search_dirs)} folders...")
+    available = get_available_names(search_dirs)
+    print(f"   ✅ {len(available)} asset names available")
 
-        for name in referenced_names:
-            if not name_exists_somewhere(name, search_dirs):
+    json_files = get_all_json_files(json_root)
+    report_lines = []
+    missing_sources = {}
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for json_file, referenced_names, error in pool.map(scan_json_file, json_files, chunksize=4):
+            print(f"📄 Processing: {json_file}")
+            if error:
+                print(f"❌ Failed to parse {json_file}: {error}")
+                continue
+
+            print(f"   🔍 Found {len(referenced_names)} referenced names")
+            missing = sorted(referenced_names - available)
+            for name in missing:
                 print(f"   ❗ Missing: {name}")
-                missing.append(name)
+                if args.sources:
+                    missing_sources.setdefault(name, []).append(json_file)
 
-        if missing:
-            report_lines.append(f"Missing files from: {json_file}")
-            report_lines.extend(missing)
-            report_lines.append("")
+            if missing:
+                report_lines.append(f"Missing files from: {json_file}")
+                report_lines.extend(missing)
+                report_lines.append("")
 
     output_path = os.path.join(json_root, "missing_files_report.txt")
     with open(output_path, "w", encoding='utf-8') as out_file:
@@ -83,5 +108,14 @@ def main():
 
     print(f"\n✅ Done. Missing file report saved to:\n{output_path}")
 
+    if args.sources:
+        sources_path = os.path.join(json_root, "missing_files_sources.txt")
+        with open(sources_path, "w", encoding='utf-8') as out_file:
+            for name in sorted(missing_sources):
+                out_file.write(f"{name}\n")
+                for json_file in missing_sources[name]:
+                    out_file.write(f"    {json_file}\n")
+        print(f"✅ Missing name sources saved to:\n{sources_path}")
+
 if __name__ == "__main__":
     main()
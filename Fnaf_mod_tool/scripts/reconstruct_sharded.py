@@ -0,0 +1,131 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+
+# Rebuilds a map as World Composition tiles, one level per XY grid cell, using
+# several editor processes at once. Run with normal Python (not inside the editor):
+#   python reconstruct_sharded.py Map.json --workers 4
+#   python reconstruct_sharded.py Map.json --dry-run   (only print the cells)
+# The spawn plan is compiled (or taken from cache) here, without the editor.
+# Each worker runs SBMapReconstuctV5.py to replay its share of the cells; a last
+# editor run creates the persistent level with World Composition enabled.
+# Output goes to SAVE_PATH/<map>/<map> with the cells in SAVE_PATH/<map>/Cells;
+# World Composition treats every map in that folder as a tile of the map.
+# Opening the persistent level in the editor loads none of the cells (load
+# them from the World Browser); at runtime cells stream in within World
+# Composition's layer streaming distance (default 50000 units) of the player.
+
+# === Make Fnaf_mod_tool/core importable ===
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(SCRIPTS_DIR))
+
+from core.map_partition import (
+    DEFAULT_CELL_SIZE, SHARD_JOB_ENV, partition_plan, assign_cells, cell_suffix, write_shard_job,
+)
+from core.editor_session import load_editor_paths, write_bootstrap, parse_result
+from core.asset_index import load_asset_index
+from core.spawn_plan import load_or_compile_plan, plan_cache_path, report
+
+# === CONFIGURATION ===
+RECONSTRUCT_SCRIPT = os.path.join(SCRIPTS_DIR, "SBMapReconstuctV5.py")
+SAVE_PATH = "/Game/Maps/RecreatedMaps"
+CONTENT_DIR = "H:/f/Fnaf_mod_tool/fnaf9/Content/"  # same as content_dir in SBMapReconstuctV5.py
+CONTENT_ROOT = "/Game/"
+
+def run_editors(uecmd, project, job_files, job_dir):
+    """Start one editor per job file at once; returns whether each job's script succeeded.
+
+    The editor's exit code doesn't reflect Python exceptions, so the script
+    runs through the session bootstrap and its result line decides.
+    """
+    bootstrap = write_bootstrap([RECONSTRUCT_SCRIPT], os.path.join(job_dir, "bootstrap.py"))
+    results = [None] * len(job_files)
+
+    def watch(i, process):
+        tag = os.path.splitext(os.path.basename(job_files[i]))[0]
+        for line in process.stdout:
+            results[i] = parse_result(line) or results[i]
+            sys.stdout.write(f"[{tag}] {line}")
+        process.wait()
+
+    watchers = []
+    for i, job_file in enumerate(job_files):
+        env = dict(os.environ)
+        env[SHARD_JOB_ENV] = job_file
+        cmd = [uecmd, project, f"-ExecutePythonScript={bootstrap}"]
+        process = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   encoding="utf-8", errors="replace")
+        watcher = threading.Thread(target=watch, args=(i, process), daemon=True)
+        watcher.start()
+        watchers.append((watcher, process))
+    for watcher, _ in watchers:
+        watcher.join()
+    return [process.returncode == 0 and bool(result and result.get("ok"))
+            for (_, process), result in zip(watchers, results)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded map reconstruction into streaming sublevels")
+    parser.add_argument("json_path", help="map JSON exported from FModel")
+    parser.add_argument("--cell-size", type=float, default=DEFAULT_CELL_SIZE, help="grid cell size in Unreal units")
+    parser.add_argument("--workers", type=int, default=4, help="editor processes to run at once")
+    parser.add_argument("--dry-run", action="store_true", help="print the cells without starting the editor")
+    parser.add_argument("--uecmd", help="UE4Editor-Cmd.exe (default: from gui.py config)")
+    parser.add_argument("--project", help=".uproject file (default: from gui.py config)")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json_path)
+    map_name = os.path.splitext(os.path.basename(json_path))[0]
+
+    start = time.time()
+    asset_index = load_asset_index(CONTENT_DIR, CONTENT_ROOT)
+    plan, from_cache = load_or_compile_plan(json_path, asset_index)
+    asset_index.save()
+    report(plan, from_cache)
+    cells = partition_plan(plan, args.cell_size)
+    map_dir = f"{SAVE_PATH}/{map_name}"
+    cells_dir = f"{map_dir}/Cells"
+    levels = {cell: f"{cells_dir}/{map_name}_{cell_suffix(cell)}" for cell in cells}
+    print(f"🗺️ {sum(len(i) for i in cells.values())} exports in {len(cells)} cells "
+          f"({args.cell_size:g} units) in {time.time() - start:.1f}s")
+    for cell, indices in cells.items():
+        print(f"   {levels[cell]}: {len(indices)} exports")
+    if args.dry_run or not cells:
+        return
+
+    saved_uecmd, saved_project = load_editor_paths()
+    uecmd = args.uecmd or saved_uecmd
+    project = args.project or saved_project
+    if not uecmd or not project:
+        print("❌ UE4Editor-Cmd / .uproject not set (pick them in gui.py or pass --uecmd/--project)")
+        raise SystemExit(1)
+
+    job_dir = tempfile.mkdtemp(prefix="map_shards_")
+    job_files = []
+    for i, bucket in enumerate(assign_cells(cells, args.workers)):
+        job = {
+            "plan_path": plan_cache_path(json_path, asset_index),
+            "cells": [{"level": levels[cell], "indices": cells[cell]} for cell in bucket],
+        }
+        job_files.append(write_shard_job(os.path.join(job_dir, f"cells_{i}.json"), job))
+
+    print(f"🚀 Building {len(cells)} cell levels with {len(job_files)} editors")
+    succeeded = run_editors(uecmd, project, job_files, job_dir)
+    failed = [job for job, ok in zip(job_files, succeeded) if not ok]
+    for job in failed:
+        print(f"❌ Editor for {job} reported an error")
+
+    persistent_job = {"persistent": f"{map_dir}/{map_name}", "cells_dir": cells_dir,
+                      "sublevels": [levels[cell] for cell in cells]}
+    persistent_file = write_shard_job(os.path.join(job_dir, "persistent.json"), persistent_job)
+    print("🗺️ Creating the World Composition persistent level")
+    ok = run_editors(uecmd, project, [persistent_file], job_dir)[0]
+    print(f"🎉 Done in {time.time() - start:.1f}s" if ok and not failed else "⚠️ Finished with errors")
+    if not ok or failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
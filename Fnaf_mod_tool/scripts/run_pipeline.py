@@ -0,0 +1,193 @@
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+# Runs the whole FModel -> UE workflow as one incremental pipeline.
+# Run with normal Python (not inside Blender or the editor):
+#   python run_pipeline.py                  (everything that is out of date)
+#   python run_pipeline.py --dry-run        (only report what would run)
+#   python run_pipeline.py reconstruct_maps (one step and what it depends on)
+# Stamps are kept in pipeline_stamps.json; delete it (or use --force) to redo everything.
+
+# === Make Fnaf_mod_tool/core importable ===
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOL_DIR = os.path.dirname(SCRIPTS_DIR)
+sys.path.append(TOOL_DIR)
+
+from core.pipeline import Pipeline, Step, FILE_LIST_ENV, write_file_list
+from core.asset_index import load_asset_index
+from core.material_dedup import ALIAS_FILE_NAME
+from core.editor_session import load_editor_paths, write_bootstrap, parse_result
+
+# === CONFIGURATION ===
+CONTENT_DIR = r"H:\f\Fnaf_mod_tool\fnaf9\Content"  # exported .uasset tree the FBX files are copied into
+MAP_JSON_DIR = r"H:\f\Fnaf_mod_tool\fnaf9\Content\json\Maps"
+MAT_JSON_DIR = r"H:\f\Fnaf_mod_tool\fnaf9\Content\json\mats"
+MESH_JSON_DIR = r"H:\f\Fnaf_mod_tool\fnaf9\Content\json\other"
+UASSET_EXPORT_DIR = r"H:/depot_747661/fnaf9/Content/Paks/Newfolder/Exports/fnaf9/Content"  # bulk_export writes FBX here
+MISSING_REPORT = os.path.join(MAP_JSON_DIR, "missing_files_report.txt")
+ALIAS_FILE = os.path.join(MAT_JSON_DIR, ALIAS_FILE_NAME)
+STAMP_FILE = os.path.join(TOOL_DIR, "pipeline_stamps.json")
+
+# === EDITOR ===
+class Runner:
+    def __init__(self, uecmd, project, workers):
+        self.uecmd = uecmd
+        self.project = project
+        self.workers = workers
+
+    def python(self, script, *args):
+        cmd = [sys.executable, os.path.join(SCRIPTS_DIR, script)] + list(args)
+        return subprocess.run(cmd, cwd=SCRIPTS_DIR).returncode == 0
+
+    def editor(self, script, files):
+        """Run an editor script on ``files`` (handed over through FILE_LIST_ENV).
+
+        The editor's exit code doesn't reflect Python exceptions, so the script
+        runs through the session bootstrap and only counts as done when its
+        result line says it succeeded.
+        """
+        if not files:
+            print(f"✅ {script}: nothing to do")
+            return True
+        if not self.uecmd or not self.project:
+            print("❌ UE4Editor-Cmd / .uproject not set (pick them in gui.py or pass --uecmd/--project)")
+            return False
+        fd, list_path = tempfile.mkstemp(prefix="pipeline_", suffix=".txt")
+        os.close(fd)
+        fd, bootstrap = tempfile.mkstemp(prefix="pipeline_bootstrap_", suffix=".py")
+        os.close(fd)
+        try:
+            write_file_list(list_path, files)
+            write_bootstrap([os.path.join(SCRIPTS_DIR, script)], bootstrap)
+            env = dict(os.environ)
+            env[FILE_LIST_ENV] = list_path
+            cmd = [self.uecmd, self.project, f"-ExecutePythonScript={bootstrap}"]
+            result = None
+            with subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                  encoding="utf-8", errors="replace") as proc:
+                for line in proc.stdout:
+                    sys.stdout.write(line)
+                    result = parse_result(line) or result
+            if proc.returncode != 0:
+                print(f"❌ {script}: editor exited with code {proc.returncode}")
+                return False
+            if result is None:
+                print(f"❌ {script}: the editor exited without reporting a result")
+                return False
+            if not result.get("ok"):
+                print(f"❌ {script} failed: {result.get('error')}")
+                return False
+            return True
+        finally:
+            os.remove(list_path)
+            os.remove(bootstrap)
+
+# === STEPS ===
+def work_files(ctx):
+    return ctx.files if ctx.forced else ctx.changed
+
+def sort_material_jsons(ctx):
+    # Same rule as MatirealJsonMoverPowerShell.txt: JSONs mentioning "Materials" are materials
+    os.makedirs(MAT_JSON_DIR, exist_ok=True)
+    moved = 0
+    for path in work_files(ctx):
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            is_material = '"Materials"' in f.read()
+        if is_material:
+            shutil.move(path, os.path.join(MAT_JSON_DIR, os.path.basename(path)))
+            moved += 1
+    print(f"📁 Moved {moved} material JSONs to {MAT_JSON_DIR}")
+
+def place_fbx(ctx):
+    # Same rule as PowerShellFbxImporter.txt: copy each FBX next to the
+    # .uasset with the same name, only for FBX files that are new or changed
+    index = load_asset_index(CONTENT_DIR)
+    copied = 0
+    for fbx_path in work_files(ctx):
+        base = os.path.splitext(os.path.basename(fbx_path))[0].lower()
+        packages = index.candidates(base)
+        if not packages:
+            print(f"❌ No matching .uasset for {base}")
+            continue
+        for package in packages:
+            rel_dir = os.path.dirname(package[len(index.content_root):].lstrip("/"))
+            dest = os.path.join(CONTENT_DIR, rel_dir, base + ".fbx")
+            shutil.copy2(fbx_path, dest)
+            copied += 1
+    print(f"📁 Copied {copied} FBX files into {CONTENT_DIR}")
+
+def apply_material_files(ctx):
+    # New aliases can change any mesh's slots, so they redo every mesh
+    if ctx.forced or os.path.normcase(os.path.abspath(ALIAS_FILE)) in ctx.changed:
+        return ctx.files
+    return ctx.changed
+
+def build_steps(runner):
+    return [
+        Step("sort_material_jsons", sort_material_jsons,
+             inputs=[MAP_JSON_DIR], outputs=[MAT_JSON_DIR], extensions=[".json"], restamp=True),
+        Step("find_missing_uassets", lambda ctx: runner.python("missingUassetsfinder.py"),
+             inputs=[MAP_JSON_DIR], outputs=[MISSING_REPORT], extensions=[".json"],
+             after=["sort_material_jsons"]),
+        Step("bulk_export", lambda ctx: runner.python(
+                 "bulk_export_pool.py", "--workers", str(runner.workers), "--list", MISSING_REPORT),
+             inputs=[MISSING_REPORT]),
+        Step("place_fbx", place_fbx,
+             inputs=[UASSET_EXPORT_DIR], extensions=[".fbx"], after=["bulk_export"]),
+        # CONTENT_DIR also holds the JSON folders, so place_fbx is linked by name
+        # rather than by declaring CONTENT_DIR as its output
+        Step("import_fbx", lambda ctx: runner.editor("FbxBatchImport.py", work_files(ctx)),
+             inputs=[CONTENT_DIR], extensions=[".fbx"], after=["place_fbx"], lock="editor"),
+        Step("generate_materials", lambda ctx: runner.editor("AutoMaterialGenerator_V5.py", work_files(ctx)),
+             inputs=[MAT_JSON_DIR], outputs=[ALIAS_FILE], extensions=[".json"], exclude=[ALIAS_FILE_NAME],
+             after=["sort_material_jsons"], lock="editor"),
+        # Re-importing a mesh resets its materials, so new imports redo the assignment
+        Step("apply_materials", lambda ctx: runner.editor("AutoMatiral3dModelConverterV2.py", apply_material_files(ctx)),
+             inputs=[MESH_JSON_DIR, ALIAS_FILE], extensions=[".json"],
+             invalidated_by=["import_fbx", "generate_materials"], lock="editor"),
+        # One editor run per new or changed map
+        Step("reconstruct_maps", lambda ctx: all(
+                 [runner.editor("SBMapReconstuctV5.py", [path]) for path in work_files(ctx)]),
+             inputs=[MAP_JSON_DIR], extensions=[".json"],
+             after=["sort_material_jsons", "apply_materials"], lock="editor"),
+    ]
+
+# === MAIN ===
+def main():
+    parser = argparse.ArgumentParser(description="Incremental FModel -> UE pipeline")
+    parser.add_argument("steps", nargs="*", help="steps to bring up to date (default: all)")
+    parser.add_argument("--dry-run", action="store_true", help="report what would run")
+    parser.add_argument("--force", action="store_true", help="redo the selected steps completely")
+    parser.add_argument("--jobs", type=int, default=4, help="steps that may run at once")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Blender processes for bulk_export")
+    parser.add_argument("--uecmd", help="UE4Editor-Cmd.exe (default: from gui.py config)")
+    parser.add_argument("--project", help=".uproject file (default: from gui.py config)")
+    parser.add_argument("--list-steps", action="store_true", help="print the steps and their dependencies")
+    args = parser.parse_args()
+
+    uecmd, project = load_editor_paths()
+    runner = Runner(args.uecmd or uecmd, args.project or project, args.workers)
+    pipeline = Pipeline(build_steps(runner), STAMP_FILE, jobs=args.jobs)
+
+    if args.list_steps:
+        for name in pipeline.steps:
+            deps = ", ".join(sorted(pipeline.deps[name])) or "-"
+            print(f"{name:22} after: {deps}")
+        return
+
+    status = pipeline.run(args.steps or None, force=args.force, dry_run=args.dry_run)
+    print("\n=== Pipeline summary ===")
+    for name in pipeline.steps:
+        if name in status:
+            print(f"  {name:22} {status[name]}")
+    if any(s in ("failed", "skipped") for s in status.values()):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()